@@ -0,0 +1,102 @@
+"""
+Per-call cost of the redis_cache payload codec.
+
+Compares the previous JSON path (dump_python + prepare_for_cache + msgspec JSON +
+TypeAdapter.validate_python) with the current msgpack path, measured through the
+cache module's own dump_payload/build_loader, for the payloads that dominate cache
+CPU time.
+Run from the repository root (needs a filled .env):
+
+    python -m scripts.benchmarks.cache_codec
+"""
+
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from pydantic import SecretStr, TypeAdapter
+
+from src.core.utils import json_utils
+from src.infrastructure.database.models.dto import SettingsDto, UserDto
+from src.infrastructure.redis.cache import build_loader, dump_payload
+
+NUMBER = 200
+USERS_COUNT = 1_000
+
+
+# The JSON path was removed from src, so its last version is kept here as the baseline
+def legacy_prepare_for_cache(obj: Any) -> Any:
+    if isinstance(obj, SecretStr):
+        return obj.get_secret_value()
+    elif isinstance(obj, dict):
+        return {k: legacy_prepare_for_cache(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_prepare_for_cache(v) for v in obj]
+    return obj
+
+
+def legacy_dump(type_adapter: TypeAdapter[Any], value: Any) -> bytes:
+    return json_utils.bytes_encode(legacy_prepare_for_cache(type_adapter.dump_python(value)))
+
+
+def make_users(count: int) -> list[UserDto]:
+    now = datetime.now(timezone.utc)
+    return [
+        UserDto(
+            id=index,
+            telegram_id=100_000 + index,
+            username=f"user_{index}",
+            referral_code=f"ref{index:08d}",
+            name=f"User {index}",
+            balance=index,
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(count)
+    ]
+
+
+def echo(line: str) -> None:
+    sys.stdout.write(line + "\n")
+
+
+def measure(label: str, func: Callable[[], Any]) -> float:
+    per_call = min(timeit.repeat(func, number=NUMBER, repeat=5)) / NUMBER
+    echo(f"  {label:<8} {per_call * 1_000_000:>10.1f} us/call")
+    return per_call
+
+
+def bench(name: str, return_type: Any, value: Any) -> None:
+    type_adapter: TypeAdapter[Any] = TypeAdapter(return_type)
+    loader = build_loader(return_type)
+
+    json_payload = legacy_dump(type_adapter, value)
+    msgpack_payload = dump_payload(type_adapter, value)
+
+    echo(f"{name}: json={len(json_payload)} bytes, msgpack={len(msgpack_payload)} bytes")
+
+    echo(" write")
+    before = measure("before", lambda: legacy_dump(type_adapter, value))
+    after = measure("after", lambda: dump_payload(type_adapter, value))
+    echo(f"  speedup  {before / after:>10.2f}x")
+
+    echo(" read")
+    before = measure(
+        "before",
+        lambda: type_adapter.validate_python(json_utils.decode(json_payload)),
+    )
+    after = measure("after", lambda: loader(msgpack_payload))
+    echo(f"  speedup  {before / after:>10.2f}x")
+
+
+def main() -> None:
+    users = make_users(USERS_COUNT)
+    bench(f"get_all (list[UserDto], {USERS_COUNT} users)", list[UserDto], users)
+    bench("get_user (Optional[UserDto])", Optional[UserDto], users[0])
+    bench("get_settings (SettingsDto)", SettingsDto, SettingsDto())
+    bench("users_count (int)", int, USERS_COUNT)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Per-update cost of dishka resolution in the bot middleware chain.
+
+Opens a REQUEST scope like the aiogram integration does for every update and resolves
+what the outer middlewares (Access, User, Rules, Channel, Throttling) ask for on the
+common path: a returning user with rules and channel checks disabled. "eager" is the
+previous chain, which resolved every service a middleware might need up front; "lazy"
+resolves only what that path uses. Infrastructure (config, bot, Redis, i18n, panel SDK)
+is replaced with placeholders and no database connection is opened, so the numbers are
+pure DI and service construction overhead.
+Run from the repository root:
+
+    python -m scripts.benchmarks.middleware_di
+"""
+
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable
+
+from aiogram import Bot
+from aiogram_dialog import BgManagerFactory
+from dishka import AsyncContainer, Provider, Scope, from_context, make_async_container
+from fluentogram import TranslatorHub
+from redis.asyncio import Redis
+from remnapy import RemnawaveSDK
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import AppConfig
+from src.infrastructure.di.providers import DatabaseProvider, ServicesProvider
+from src.infrastructure.redis import RedisRepository
+from src.services.access import AccessService
+from src.services.notification import NotificationService
+from src.services.plan import PlanService
+from src.services.referral import ReferralService
+from src.services.remnawave import RemnawaveService
+from src.services.settings import SettingsService
+from src.services.subscription import SubscriptionService
+from src.services.user import UserService
+
+NUMBER = 5_000
+
+EAGER: list[type] = [
+    AccessService,
+    NotificationService,
+    AppConfig,
+    UserService,
+    ReferralService,
+    RemnawaveService,
+    PlanService,
+    SubscriptionService,
+    SettingsService,
+    SettingsService,
+    NotificationService,
+]
+LAZY: list[type] = [
+    AccessService,
+    UserService,
+    AppConfig,
+    SettingsService,
+    SettingsService,
+    AppConfig,
+    Redis,
+]
+
+
+class PlaceholderProvider(Provider):
+    scope = Scope.APP
+
+    config = from_context(provides=AppConfig)
+    bot = from_context(provides=Bot)
+    redis_client = from_context(provides=Redis)
+    redis_repository = from_context(provides=RedisRepository)
+    translator_hub = from_context(provides=TranslatorHub)
+    remnawave = from_context(provides=RemnawaveSDK)
+    bg_manager_factory = from_context(provides=BgManagerFactory)
+    session_maker = from_context(provides=async_sessionmaker[AsyncSession])
+
+
+def echo(line: str) -> None:
+    sys.stdout.write(line + "\n")
+
+
+def create_container() -> AsyncContainer:
+    placeholder = SimpleNamespace()
+    context: dict[Any, Any] = {
+        AppConfig: placeholder,
+        Bot: placeholder,
+        Redis: placeholder,
+        RedisRepository: placeholder,
+        TranslatorHub: placeholder,
+        RemnawaveSDK: placeholder,
+        BgManagerFactory: placeholder,
+        async_sessionmaker[AsyncSession]: async_sessionmaker(expire_on_commit=False),
+    }
+    return make_async_container(
+        DatabaseProvider(),
+        ServicesProvider(),
+        PlaceholderProvider(),
+        context=context,
+        skip_validation=True,
+    )
+
+
+def make_update(container: AsyncContainer, dependencies: list[type]) -> Callable[[], Awaitable]:
+    async def update() -> None:
+        async with container() as request_container:
+            for dependency in dependencies:
+                await request_container.get(dependency)
+
+    return update
+
+
+async def measure(label: str, func: Callable[[], Awaitable]) -> float:
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(NUMBER):
+            await func()
+        best = min(best, (time.perf_counter() - started) / NUMBER)
+
+    echo(f"  {label:<8} {best * 1_000_000:>10.1f} us/update")
+    return best
+
+
+async def main() -> None:
+    container = create_container()
+
+    echo("Empty REQUEST scope")
+    await measure("scope", make_update(container, []))
+
+    echo("Middleware chain, returning user")
+    eager = await measure("eager", make_update(container, EAGER))
+    lazy = await measure("lazy", make_update(container, LAZY))
+    echo(f"  speedup  {eager / lazy:>10.2f}x")
+
+    await container.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+"""
+Per-call cost of StorageKey.pack.
+
+Compares the previous implementation (model_dump(mode="json") + sort + encode on every
+call) with the compiled one, for a key with fields and a fieldless key, both when the key
+is built once and packed repeatedly and when a new key is built for every call.
+Run from the repository root:
+
+    python -m scripts.benchmarks.storage_key
+"""
+
+import sys
+import timeit
+from typing import Any, Callable
+
+from src.core.storage.key_builder import StorageKey
+from src.core.storage.keys import RecentActivityUsersKey, WebhookLockKey
+
+NUMBER = 100_000
+
+
+def legacy_pack(key: StorageKey) -> str:
+    result = [key.__prefix__] if key.__prefix__ else []
+    dumped_data = key.model_dump(mode="json")
+
+    for name in sorted(dumped_data.keys()):
+        encoded = key.encode_value(dumped_data[name])
+        if key.__separator__ in encoded:
+            raise ValueError(f"Separator symbol can not be used in value {name}={encoded!r}")
+        result.append(encoded)
+    return key.__separator__.join(result)
+
+
+def echo(line: str) -> None:
+    sys.stdout.write(line + "\n")
+
+
+def measure(label: str, func: Callable[[], Any]) -> float:
+    per_call = min(timeit.repeat(func, number=NUMBER, repeat=5)) / NUMBER
+    echo(f"  {label:<8} {per_call * 1_000_000_000:>10.1f} ns/call")
+    return per_call
+
+
+def bench(name: str, build: Callable[[], StorageKey]) -> None:
+    key = build()
+    assert legacy_pack(key) == key.pack()
+
+    echo(f"{name}: '{key.pack()}'")
+    for label, before_func, after_func in (
+        ("pack", lambda: legacy_pack(key), key.pack),
+        ("build+pack", lambda: legacy_pack(build()), lambda: build().pack()),
+    ):
+        echo(f" {label}")
+        before = measure("before", before_func)
+        after = measure("after", after_func)
+        echo(f"  speedup  {before / after:>10.2f}x")
+
+
+def main() -> None:
+    bench("WebhookLockKey", lambda: WebhookLockKey(bot_id=123456789, webhook_hash="a1b2c3"))
+    bench("RecentActivityUsersKey", RecentActivityUsersKey)
+
+
+if __name__ == "__main__":
+    main()
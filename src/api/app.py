@@ -2,8 +2,17 @@ from aiogram import Dispatcher
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
-from src.api.endpoints import TelegramWebhookEndpoint, connect_router, payments_router, remnawave_router
+from src.api.endpoints import (
+    TelegramWebhookEndpoint,
+    connect_router,
+    metrics_router,
+    payments_router,
+    remnawave_router,
+)
+from src.api.executor import UpdateExecutor
+from src.api.update_stream import UpdateStream
 from src.core.config import AppConfig
+from src.core.enums import UpdateIngestionMode
 from src.lifespan import lifespan
 
 
@@ -19,10 +28,24 @@ def create_app(config: AppConfig, dispatcher: Dispatcher) -> FastAPI:
     app.include_router(connect_router)
     app.include_router(payments_router)
     app.include_router(remnawave_router)
+    app.include_router(metrics_router)
 
     telegram_webhook_endpoint = TelegramWebhookEndpoint(
         dispatcher=dispatcher,
         secret_token=config.bot.secret_token.get_secret_value(),
+        executor=UpdateExecutor(
+            workers=config.bot.update_workers,
+            queue_size=config.bot.update_queue_size,
+            overflow_policy=config.bot.update_overflow_policy,
+        ),
+        update_stream=(
+            UpdateStream(
+                partitions=config.bot.update_stream_partitions,
+                max_len=config.bot.update_stream_max_len,
+            )
+            if config.bot.update_ingestion == UpdateIngestionMode.STREAM
+            else None
+        ),
     )
     telegram_webhook_endpoint.register(app=app, path=config.bot.webhook_path)
     app.state.telegram_webhook_endpoint = telegram_webhook_endpoint
@@ -1,10 +1,12 @@
 from .connect import router as connect_router
+from .metrics import router as metrics_router
 from .payments import router as payments_router
 from .remnawave import router as remnawave_router
 from .telegram import TelegramWebhookEndpoint
 
 __all__ = [
     "connect_router",
+    "metrics_router",
     "payments_router",
     "remnawave_router",
     "TelegramWebhookEndpoint",
@@ -0,0 +1,56 @@
+import hmac
+from dataclasses import asdict
+from typing import Any, Optional
+
+from dishka import FromDishka
+from dishka.integrations.fastapi import inject
+from fastapi import APIRouter, Header, HTTPException, Request, status
+
+from src.core.config import AppConfig
+from src.core.constants import API_V1, METRICS_PATH
+from src.core.utils.latency import latency_recorder
+from src.infrastructure.redis import throttling_stats
+
+router = APIRouter(prefix=API_V1 + METRICS_PATH, tags=["metrics"])
+
+
+def _check_token(config: AppConfig, x_metrics_token: Optional[str]) -> None:
+    secret_token = config.bot.secret_token.get_secret_value()
+    if x_metrics_token is None or not hmac.compare_digest(x_metrics_token, secret_token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+
+@router.get("/latency")
+@inject
+async def latency_metrics(
+    config: FromDishka[AppConfig],
+    x_metrics_token: Optional[str] = Header(default=None),
+) -> dict[str, Any]:
+    if not latency_recorder.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    _check_token(config, x_metrics_token)
+    return {"latency": latency_recorder.snapshot()}
+
+
+@router.get("/executor")
+@inject
+async def executor_metrics(
+    request: Request,
+    config: FromDishka[AppConfig],
+    x_metrics_token: Optional[str] = Header(default=None),
+) -> dict[str, Any]:
+    _check_token(config, x_metrics_token)
+    return asdict(request.app.state.telegram_webhook_endpoint.executor.stats)
+
+
+@router.get("/throttling")
+@inject
+async def throttling_metrics(
+    config: FromDishka[AppConfig],
+    x_metrics_token: Optional[str] = Header(default=None),
+) -> dict[str, Any]:
+    _check_token(config, x_metrics_token)
+    return {
+        event_type: asdict(counters) for event_type, counters in throttling_stats.events.items()
+    }
@@ -1,36 +1,45 @@
-import asyncio
 import secrets
-from typing import Annotated, Any
+from typing import Annotated, Optional
 
 from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
 from aiogram.methods import TelegramMethod
 from aiogram.types import Update
 from dishka.integrations.fastapi import FromDishka, inject
-from fastapi import Body, FastAPI, Header, HTTPException, Response, status
+from fastapi import Body, FastAPI, Header, HTTPException, Request, Response, status
 from loguru import logger
+from redis.asyncio import Redis
+
+from src.api.executor import UpdateExecutor
+from src.api.update_stream import UpdateStream
+from src.core.enums import UpdateOverflowPolicy
 
 
 class TelegramWebhookEndpoint:
     dispatcher: Dispatcher
     secret_token: str
-    _feed_update_tasks: set[asyncio.Task[Any]]
+    executor: UpdateExecutor
+    update_stream: Optional[UpdateStream]
 
-    def __init__(self, dispatcher: Dispatcher, secret_token: str) -> None:
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        secret_token: str,
+        executor: UpdateExecutor,
+        update_stream: Optional[UpdateStream] = None,
+    ) -> None:
         self.dispatcher = dispatcher
         self.secret_token = secret_token
-        self._feed_update_tasks = set()
+        self.executor = executor
+        self.update_stream = update_stream
 
     async def startup(self) -> None:
+        await self.executor.start()
         await self.dispatcher.emit_startup(**self.dispatcher.workflow_data)
 
     async def shutdown(self) -> None:
         await self.dispatcher.emit_shutdown(**self.dispatcher.workflow_data)
-
-        for task in list(self._feed_update_tasks):
-            if not task.done():
-                task.cancel()
-
-        await asyncio.gather(*self._feed_update_tasks, return_exceptions=True)
+        await self.executor.stop()
 
     def register(self, app: FastAPI, path: str) -> None:
         app.add_api_route(path=path, endpoint=self._handle_request, methods=["POST"])
@@ -38,25 +47,62 @@ class TelegramWebhookEndpoint:
     def _verify_secret(self, telegram_secret_token: str) -> bool:
         return secrets.compare_digest(telegram_secret_token, self.secret_token)
 
+    @staticmethod
+    def _get_order_key(update: Update) -> Optional[int]:
+        context = UserContextMiddleware.resolve_event_context(update)
+        if context.chat is not None:
+            return context.chat.id
+        return context.user_id
+
     async def _feed_update(self, bot: Bot, update: Update) -> None:
         result = await self.dispatcher.feed_update(bot=bot, update=update)
         if isinstance(result, TelegramMethod):
             await self.dispatcher.silent_call_request(bot=bot, result=result)
 
+    async def feed_raw_update(self, bot: Bot, payload: bytes) -> None:
+        update = Update.model_validate_json(payload, context={"bot": bot})
+        await self._feed_update(bot=bot, update=update)
+
     @inject
     async def _handle_request(
         self,
+        request: Request,
         update: Annotated[Update, Body()],
         x_telegram_bot_api_secret_token: Annotated[str, Header()],
         bot: FromDishka[Bot],
+        redis_client: FromDishka[Redis],
     ) -> Response:
         if not self._verify_secret(x_telegram_bot_api_secret_token):
             logger.warning(f"Invalid secret token for update '{update.update_id}'")
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
-        task = asyncio.create_task(self._feed_update(bot=bot, update=update))
-        self._feed_update_tasks.add(task)
-        task.add_done_callback(self._feed_update_tasks.discard)
+        if self.update_stream is not None:
+            # The raw body is stored as is, any bot process may pick it up
+            await self.update_stream.append(
+                redis_client,
+                payload=await request.body(),
+                order_key=self._get_order_key(update),
+            )
+            logger.debug(f"Update '{update.update_id}' appended to update stream")
+            return Response(status_code=status.HTTP_200_OK)
+
+        accepted = await self.executor.submit(
+            lambda: self._feed_update(bot=bot, update=update),
+            order_key=self._get_order_key(update),
+        )
+
+        if not accepted:
+            policy = self.executor.overflow_policy
+            logger.warning(
+                f"Update '{update.update_id}' not queued: update queue is full "
+                f"(policy={policy}, queued={self.executor.stats.queued})"
+            )
+            if policy == UpdateOverflowPolicy.REJECT:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Update queue is full",
+                )
+            return Response(status_code=status.HTTP_200_OK)
 
         logger.debug(f"Update '{update.update_id}' scheduled for processing")
         return Response(status_code=status.HTTP_200_OK)
@@ -0,0 +1,121 @@
+import asyncio
+import itertools
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+from loguru import logger
+
+from src.core.enums import UpdateOverflowPolicy
+
+Job = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class UpdateExecutorStats:
+    submitted: int = 0
+    processed: int = 0
+    failed: int = 0
+    dropped: int = 0
+    rejected: int = 0
+    active: int = 0
+    queued: int = 0
+    max_queued: int = 0
+
+
+class UpdateExecutor:
+    """
+    Bounded, per-chat ordered front-end for update processing.
+
+    Jobs are routed to one of `workers` FIFO shards by their order key (chat id), so jobs
+    with the same key run one after another in submission order while at most `workers`
+    jobs run at once. Jobs without a key are spread round-robin. Each shard holds up to
+    `queue_size` jobs; `overflow_policy` decides what happens to a job submitted to a full
+    shard: WAIT blocks the submitter, DROP and REJECT discard the job and let the caller
+    tell the two apart.
+    """
+
+    workers: int
+    queue_size: int
+    overflow_policy: UpdateOverflowPolicy
+    stats: UpdateExecutorStats
+    _queues: list[asyncio.Queue[Job]]
+    _tasks: list[asyncio.Task[None]]
+    _round_robin: Iterator[int]
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        overflow_policy: UpdateOverflowPolicy = UpdateOverflowPolicy.WAIT,
+    ) -> None:
+        if workers < 1 or queue_size < 1:
+            raise ValueError("Update executor needs at least one worker and queue slot")
+
+        self.workers = workers
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.stats = UpdateExecutorStats()
+        self._queues = []
+        self._tasks = []
+        self._round_robin = itertools.count()
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(self.workers)]
+        self._tasks = [asyncio.create_task(self._work(queue)) for queue in self._queues]
+        logger.info(
+            f"Update executor started: workers={self.workers}, queue_size={self.queue_size}, "
+            f"overflow_policy={self.overflow_policy}"
+        )
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queues = []
+        self.stats.queued = 0
+        logger.info(f"Update executor stopped: {self.stats}")
+
+    async def submit(self, job: Job, order_key: Optional[int] = None, wait: bool = False) -> bool:
+        """
+        Queue `job`. Returns False when it was dropped or rejected by the overflow policy.
+        With `wait`, the job is always queued as if the policy were WAIT.
+        """
+        if not self._queues:
+            raise RuntimeError("Update executor is not started")
+
+        if order_key is None:
+            order_key = next(self._round_robin)
+        queue = self._queues[order_key % self.workers]
+
+        if queue.full() and not wait and self.overflow_policy != UpdateOverflowPolicy.WAIT:
+            if self.overflow_policy == UpdateOverflowPolicy.DROP:
+                self.stats.dropped += 1
+            else:
+                self.stats.rejected += 1
+            return False
+
+        await queue.put(job)
+        self.stats.submitted += 1
+        self.stats.queued += 1
+        self.stats.max_queued = max(self.stats.max_queued, self.stats.queued)
+        return True
+
+    async def _work(self, queue: asyncio.Queue[Job]) -> None:
+        while True:
+            job = await queue.get()
+            self.stats.queued -= 1
+            self.stats.active += 1
+            try:
+                await job()
+                self.stats.processed += 1
+            except Exception as exception:
+                self.stats.failed += 1
+                logger.exception(f"Update processing failed: {exception}")
+            finally:
+                self.stats.active -= 1
+                queue.task_done()
@@ -0,0 +1,355 @@
+import asyncio
+import math
+import random
+import time
+from typing import Any, Awaitable, Callable, Final, Optional
+from uuid import uuid4
+
+from loguru import logger
+from redis.asyncio import Redis
+
+from src.api.executor import UpdateExecutor
+
+UPDATE_STREAM_PREFIX: Final[str] = "telegram_updates"
+UPDATE_STREAM_GROUP: Final[str] = "dispatcher"
+UPDATE_STREAM_CONSUMERS_KEY: Final[str] = "telegram_updates_consumers"
+UPDATE_STREAM_LEASE_TTL: Final[int] = 10_000  # ms
+UPDATE_STREAM_READ_BLOCK: Final[int] = 1_000  # ms
+UPDATE_STREAM_READ_COUNT: Final[int] = 100
+UPDATE_STREAM_DRAIN_TIMEOUT: Final[float] = 10
+
+# Lease operations must only touch a lease still held by this consumer
+_RENEW_LEASE_SCRIPT: Final[str] = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LEASE_SCRIPT: Final[str] = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+UpdateHandler = Callable[[bytes], Awaitable[Any]]
+
+
+class UpdateStream:
+    """
+    Raw Telegram updates partitioned by chat id over `partitions` Redis streams.
+
+    Updates of one chat always land in the same partition, and every partition is read
+    by a single `UpdateStreamConsumer` at a time, so per-chat order survives scaling the
+    bot out to several processes.
+    """
+
+    partitions: int
+    max_len: int
+
+    def __init__(self, partitions: int, max_len: int) -> None:
+        if partitions < 1:
+            raise ValueError("Update stream needs at least one partition")
+
+        self.partitions = partitions
+        self.max_len = max_len
+
+    def stream_key(self, partition: int) -> str:
+        return f"{UPDATE_STREAM_PREFIX}:{partition}"
+
+    def lease_key(self, partition: int) -> str:
+        return f"{UPDATE_STREAM_PREFIX}:{partition}:lease"
+
+    def partition_of(self, order_key: Optional[int]) -> int:
+        if order_key is None:
+            return random.randrange(self.partitions)
+        return order_key % self.partitions
+
+    async def append(self, redis: Redis, payload: bytes, order_key: Optional[int]) -> None:
+        fields = {"update": payload, "key": "" if order_key is None else str(order_key)}
+        await redis.xadd(
+            self.stream_key(self.partition_of(order_key)),
+            fields,  # type: ignore[arg-type]
+            maxlen=self.max_len,
+            approximate=True,
+        )
+
+
+class UpdateStreamConsumer:
+    """
+    Feeds updates from the partitions leased by this process into an `UpdateExecutor`.
+
+    Consumers heartbeat into a shared sorted set and each one leases at most its fair share
+    of partitions. Leases are renewed by a separate task, so a reader blocked on a full
+    executor does not lose them. An excess partition is first excluded from reads and
+    released by the reader only once its in-flight updates are done. After taking over
+    a partition, the consumer first claims the entries left pending by the previous owner
+    and only then reads new ones. Entries are acknowledged after processing, so an update
+    is lost only if its handler fails, never because a process died.
+
+    A consumer that loses a lease stops processing the partition's queued entries and
+    leaves them pending. The new owner only claims entries idle for a whole lease TTL, so
+    it does not take over one the previous owner may still be handling.
+    """
+
+    redis: Redis
+    stream: UpdateStream
+    executor: UpdateExecutor
+    handle: UpdateHandler
+    name: str
+    _owned: set[int]
+    _recovering: set[int]
+    _releasing: set[int]
+    _in_flight: dict[int, int]
+    _tasks: list[asyncio.Task[None]]
+    _recover_tasks: set[asyncio.Task[None]]
+
+    def __init__(
+        self,
+        redis: Redis,
+        stream: UpdateStream,
+        executor: UpdateExecutor,
+        handle: UpdateHandler,
+    ) -> None:
+        self.redis = redis
+        self.stream = stream
+        self.executor = executor
+        self.handle = handle
+        self.name = uuid4().hex
+        self._owned = set()
+        self._recovering = set()
+        self._releasing = set()
+        self._in_flight = {}
+        self._tasks = []
+        self._recover_tasks = set()
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+
+        for partition in range(self.stream.partitions):
+            try:
+                await self.redis.xgroup_create(
+                    name=self.stream.stream_key(partition),
+                    groupname=UPDATE_STREAM_GROUP,
+                    id="0",
+                    mkstream=True,
+                )
+            except Exception as exception:
+                if "BUSYGROUP" not in str(exception):
+                    raise
+
+        self._tasks = [
+            asyncio.create_task(self._heartbeat()),
+            asyncio.create_task(self._read()),
+        ]
+        logger.info(f"Update stream consumer '{self.name}' started")
+
+    async def stop(self) -> None:
+        if not self._tasks:
+            return
+
+        tasks = [*self._tasks, *self._recover_tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+
+        deadline = time.monotonic() + UPDATE_STREAM_DRAIN_TIMEOUT
+        while any(self._in_flight.values()) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+
+        for partition in list(self._owned):
+            await self._release(partition)
+        await self.redis.zrem(UPDATE_STREAM_CONSUMERS_KEY, self.name)
+        logger.info(f"Update stream consumer '{self.name}' stopped")
+
+    async def _heartbeat(self) -> None:
+        while True:
+            try:
+                await self._balance()
+            except Exception as exception:
+                logger.warning(f"Update stream consumer '{self.name}' balance failed: {exception}")
+            await asyncio.sleep(UPDATE_STREAM_LEASE_TTL / 3000)
+
+    async def _read(self) -> None:
+        while True:
+            for partition in list(self._releasing):
+                if not self._in_flight.get(partition):
+                    self._releasing.discard(partition)
+                    await self._release(partition)
+
+            readable = sorted(self._owned - self._recovering - self._releasing)
+            if not readable:
+                await asyncio.sleep(UPDATE_STREAM_READ_BLOCK / 1000)
+                continue
+
+            try:
+                response = await self.redis.xreadgroup(
+                    groupname=UPDATE_STREAM_GROUP,
+                    consumername=self.name,
+                    streams={self.stream.stream_key(p): ">" for p in readable},
+                    count=UPDATE_STREAM_READ_COUNT,
+                    block=UPDATE_STREAM_READ_BLOCK,
+                )
+                for stream_key, entries in response or []:
+                    partition = int(stream_key.decode().rsplit(":", 1)[1])
+                    await self._submit_batch(partition, entries)
+            except Exception as exception:
+                logger.warning(f"Update stream consumer '{self.name}' read failed: {exception}")
+                await asyncio.sleep(UPDATE_STREAM_READ_BLOCK / 1000)
+
+    async def _balance(self) -> None:
+        now = time.time()
+        await self.redis.zadd(UPDATE_STREAM_CONSUMERS_KEY, {self.name: now})
+        await self.redis.zremrangebyscore(
+            UPDATE_STREAM_CONSUMERS_KEY,
+            "-inf",
+            now - UPDATE_STREAM_LEASE_TTL / 1000,
+        )
+        consumers = max(1, await self.redis.zcard(UPDATE_STREAM_CONSUMERS_KEY))
+        fair_share = math.ceil(self.stream.partitions / consumers)
+
+        for partition in list(self._owned):
+            renewed = await self.redis.eval(
+                _RENEW_LEASE_SCRIPT,
+                1,
+                self.stream.lease_key(partition),
+                self.name,
+                UPDATE_STREAM_LEASE_TTL,
+            )
+            if not renewed:
+                self._owned.discard(partition)
+                self._releasing.discard(partition)
+                logger.warning(f"Update stream partition '{partition}' lease lost")
+
+        kept = self._owned - self._releasing
+        for partition in sorted(kept - self._recovering, reverse=True):
+            if len(kept) <= fair_share:
+                break
+            kept.discard(partition)
+            self._releasing.add(partition)
+
+        offset = random.randrange(self.stream.partitions)
+        for index in range(self.stream.partitions):
+            if len(self._owned - self._releasing) >= fair_share:
+                break
+
+            partition = (offset + index) % self.stream.partitions
+            if partition in self._owned:
+                continue
+
+            acquired = await self.redis.set(
+                self.stream.lease_key(partition),
+                self.name,
+                nx=True,
+                px=UPDATE_STREAM_LEASE_TTL,
+            )
+            if acquired:
+                self._owned.add(partition)
+                self._recovering.add(partition)
+                logger.debug(f"Update stream partition '{partition}' acquired")
+                task = asyncio.create_task(self._recover(partition))
+                self._recover_tasks.add(task)
+                task.add_done_callback(self._recover_tasks.discard)
+
+    async def _recover(self, partition: int) -> None:
+        try:
+            # New entries are read only once nothing is left pending for other consumers
+            while await self._claim_pending(partition):
+                await asyncio.sleep(UPDATE_STREAM_READ_BLOCK / 1000)
+        except Exception as exception:
+            # Give the partition up so that it is recovered again, by us or another consumer
+            logger.warning(f"Update stream partition '{partition}' recovery failed: {exception}")
+            await self._release(partition)
+        finally:
+            self._recovering.discard(partition)
+
+    async def _claim_pending(self, partition: int) -> int:
+        """Claim the entries idle for a lease TTL; returns how many other consumers still hold."""
+        stream_key = self.stream.stream_key(partition)
+        start_id = "0-0"
+        while True:
+            response = await self.redis.xautoclaim(
+                name=stream_key,
+                groupname=UPDATE_STREAM_GROUP,
+                consumername=self.name,
+                min_idle_time=UPDATE_STREAM_LEASE_TTL,
+                start_id=start_id,
+                count=UPDATE_STREAM_READ_COUNT,
+            )
+            start_id, entries = response[0], response[1]
+            # Entries trimmed from the stream while pending are already dropped from the PEL
+            await self._submit_batch(partition, entries)
+
+            if entries:
+                logger.info(
+                    f"Update stream partition '{partition}': "
+                    f"{len(entries)} pending entries claimed"
+                )
+            if start_id in (b"0-0", "0-0"):
+                break
+
+        pending = await self.redis.xpending(stream_key, UPDATE_STREAM_GROUP)
+        return sum(
+            consumer["pending"]
+            for consumer in pending["consumers"]
+            if consumer["name"] not in (self.name, self.name.encode())
+        )
+
+    async def _submit_batch(self, partition: int, entries: list[Any]) -> None:
+        # Count the whole batch first: the partition must not be released halfway through it
+        self._in_flight[partition] = self._in_flight.get(partition, 0) + len(entries)
+        remaining = len(entries)
+        try:
+            for entry_id, fields in entries:
+                remaining -= 1
+                await self._submit(partition, entry_id, fields)
+        finally:
+            # `_submit` settles its own entry; the ones after a failed one were never handed over
+            self._in_flight[partition] -= remaining
+
+    async def _submit(self, partition: int, entry_id: bytes, fields: Optional[dict]) -> None:
+        if not fields:
+            await self._done(partition, entry_id)
+            return
+
+        raw_key = fields.get(b"key", b"")
+        order_key = int(raw_key) if raw_key else None
+        payload: bytes = fields[b"update"]
+
+        async def job() -> None:
+            if partition not in self._owned:
+                # The lease is lost: leave the entry pending for the new owner to claim
+                self._in_flight[partition] -= 1
+                return
+
+            try:
+                await self.handle(payload)
+            finally:
+                await self._done(partition, entry_id)
+
+        submitted = False
+        try:
+            submitted = await self.executor.submit(job, order_key=order_key, wait=True)
+        finally:
+            if not submitted:
+                # The job never runs, so nothing else uncounts the entry; it stays pending
+                self._in_flight[partition] -= 1
+
+    async def _done(self, partition: int, entry_id: bytes) -> None:
+        # Acknowledge before uncounting, so that a released partition has nothing pending
+        try:
+            await self.redis.xack(self.stream.stream_key(partition), UPDATE_STREAM_GROUP, entry_id)
+        finally:
+            self._in_flight[partition] -= 1
+
+    async def _release(self, partition: int) -> None:
+        self._owned.discard(partition)
+        await self.redis.eval(
+            _RELEASE_LEASE_SCRIPT,
+            1,
+            self.stream.lease_key(partition),
+            self.name,
+        )
+        logger.debug(f"Update stream partition '{partition}' released")
@@ -0,0 +1,184 @@
+import asyncio
+import hashlib
+import time
+from typing import Final, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import NoScriptError
+
+from src.core.storage.keys import MessageDeletionsKey
+
+DELETE_MESSAGES_LIMIT: Final[int] = 100  # Telegram's deleteMessages cap per call
+DELETION_SWEEP_INTERVAL: Final[float] = 0.25
+DELETION_SWEEP_BATCH: Final[int] = 1_000
+DELETION_CALLS_PER_SECOND: Final[float] = 20
+DELETION_RETRY_DELAY: Final[float] = 1  # doubled on every further attempt
+DELETION_MAX_ATTEMPTS: Final[int] = 5
+
+# Telegram's answers for messages that are already gone or can never be deleted
+_PERMANENT_ERRORS: Final[tuple[str, ...]] = ("message to delete not found", "can't be deleted")
+
+# Takes up to ARGV[2] due entries out of the set in one step, so concurrent sweepers
+# never get the same entry
+_CLAIM_DUE_SCRIPT: Final[str] = """
+local items = redis.call('zrangebyscore', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #items > 0 then
+    redis.call('zrem', KEYS[1], unpack(items))
+end
+return items
+"""
+_CLAIM_DUE_SHA: Final[str] = hashlib.sha1(_CLAIM_DUE_SCRIPT.encode()).hexdigest()
+
+
+async def schedule_message_deletion(
+    redis: Redis,
+    chat_id: int,
+    message_id: int,
+    delay: float = 0,
+) -> None:
+    """Queue a message for deletion by `MessageDeletionSweeper` after `delay` seconds."""
+    member = f"{chat_id}:{message_id}"
+    await redis.zadd(MessageDeletionsKey().pack(), {member: time.time() + delay})
+
+
+class MessageDeletionSweeper:
+    """
+    Drains the shared sorted set of scheduled deletions (score = due time).
+
+    Every sweep claims the due entries atomically, groups them by chat and deletes them with
+    `deleteMessages`, up to 100 ids per call, spacing calls to stay under `calls_per_second`.
+    Entries live in Redis, so they are shared by all bot and worker processes and survive
+    restarts; any number of sweepers may run at once. A failed call puts its entries back
+    with a growing delay (or Telegram's `retry_after`), up to `DELETION_MAX_ATTEMPTS`;
+    they are dropped at once only when Telegram reports the messages can not be deleted.
+    """
+
+    redis: Redis
+    bot: Bot
+    interval: float
+    calls_per_second: float
+    _task: Optional[asyncio.Task[None]]
+
+    def __init__(
+        self,
+        redis: Redis,
+        bot: Bot,
+        interval: float = DELETION_SWEEP_INTERVAL,
+        calls_per_second: float = DELETION_CALLS_PER_SECOND,
+    ) -> None:
+        self.redis = redis
+        self.bot = bot
+        self.interval = interval
+        self.calls_per_second = calls_per_second
+        self._task = None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+
+        self._task = asyncio.create_task(self._run())
+        logger.debug("Message deletion sweeper started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+        try:
+            await self.sweep()
+        except Exception as exception:
+            logger.warning(f"Final message deletion sweep failed: {exception}")
+        logger.debug("Message deletion sweeper stopped")
+
+    async def sweep(self) -> None:
+        while True:
+            items = await self._claim_due()
+            if not items:
+                return
+
+            # Retried entries carry their attempt number as a third part
+            due: dict[int, dict[int, int]] = {}
+            for item in items:
+                chat_id, message_id, *attempt = item.decode().split(":")
+                chat_due = due.setdefault(int(chat_id), {})
+                chat_due[int(message_id)] = int(attempt[0]) if attempt else 0
+
+            calls = 0
+            for chat_id, attempts in due.items():
+                message_ids = list(attempts)
+                for start in range(0, len(message_ids), DELETE_MESSAGES_LIMIT):
+                    if calls:
+                        await asyncio.sleep(1 / self.calls_per_second)
+                    batch = message_ids[start : start + DELETE_MESSAGES_LIMIT]
+                    await self._delete(chat_id, {i: attempts[i] for i in batch})
+                    calls += 1
+
+            if len(items) < DELETION_SWEEP_BATCH:
+                return
+
+    async def _claim_due(self) -> list[bytes]:
+        keys = (MessageDeletionsKey().pack(),)
+        args = (time.time(), DELETION_SWEEP_BATCH)
+        try:
+            return await self.redis.evalsha(  # type: ignore[no-any-return, misc]
+                _CLAIM_DUE_SHA, len(keys), *keys, *args
+            )
+        except NoScriptError:
+            return await self.redis.eval(  # type: ignore[no-any-return, misc]
+                _CLAIM_DUE_SCRIPT, len(keys), *keys, *args
+            )
+
+    async def _delete(self, chat_id: int, attempts: dict[int, int]) -> None:
+        try:
+            await self.bot.delete_messages(chat_id=chat_id, message_ids=list(attempts))
+            logger.debug(f"Deleted '{len(attempts)}' messages in chat '{chat_id}'")
+        except (TelegramBadRequest, TelegramForbiddenError) as exception:
+            if isinstance(exception, TelegramForbiddenError) or any(
+                error in exception.message for error in _PERMANENT_ERRORS
+            ):
+                logger.warning(
+                    f"Dropped '{len(attempts)}' undeletable messages in chat '{chat_id}': "
+                    f"{exception}"
+                )
+                return
+            await self._retry(chat_id, attempts, exception)
+        except TelegramRetryAfter as exception:
+            await self._retry(chat_id, attempts, exception, delay=exception.retry_after)
+        except Exception as exception:
+            await self._retry(chat_id, attempts, exception)
+
+    async def _retry(
+        self,
+        chat_id: int,
+        attempts: dict[int, int],
+        exception: Exception,
+        delay: Optional[float] = None,
+    ) -> None:
+        now = time.time()
+        retries: dict[str, float] = {}
+        for message_id, attempt in attempts.items():
+            if attempt + 1 >= DELETION_MAX_ATTEMPTS:
+                continue
+            retry_delay = delay if delay is not None else DELETION_RETRY_DELAY * 2**attempt
+            retries[f"{chat_id}:{message_id}:{attempt + 1}"] = now + retry_delay
+
+        if retries:
+            await self.redis.zadd(MessageDeletionsKey().pack(), retries)
+        logger.warning(
+            f"Failed to delete '{len(attempts)}' messages in chat '{chat_id}', "
+            f"'{len(retries)}' will be retried: {exception}"
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as exception:
+                logger.warning(f"Message deletion sweep failed: {exception}")
@@ -4,7 +4,7 @@ from aiogram.fsm.storage.redis import RedisStorage
 from aiogram_dialog import BgManagerFactory, setup_dialogs
 
 from src.bot.filters import setup_global_filters
-from src.bot.middlewares import setup_middlewares
+from src.bot.middlewares import setup_latency_metrics, setup_middlewares
 from src.bot.routers import setup_error_handlers, setup_routers
 from src.core.config import AppConfig
 from src.core.utils import json_utils
@@ -37,3 +37,7 @@ def setup_dispatcher(dispatcher: Dispatcher) -> None:
     setup_global_filters(router=dispatcher)
     setup_routers(router=dispatcher)
     setup_error_handlers(router=dispatcher)
+
+    config: AppConfig = dispatcher["config"]
+    if config.bot.latency_metrics:
+        setup_latency_metrics(router=dispatcher)
@@ -3,7 +3,18 @@ from typing import Final, Tuple
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram_dialog import StartMode
-from aiogram_dialog.widgets.kbd import Row, Start, SwitchTo, Url, WebApp
+from aiogram_dialog.widgets.kbd import (
+    CurrentPage,
+    FirstPage,
+    LastPage,
+    NextPage,
+    PrevPage,
+    Row,
+    Start,
+    SwitchTo,
+    Url,
+    WebApp,
+)
 from aiogram_dialog.widgets.text import Format
 from magic_filter import F
 
@@ -53,6 +64,22 @@ def get_back_and_main_menu_buttons(back_state) -> Tuple[Row]:
         ),
     )
 
+
+def get_keyset_pager(scroll: str) -> Row:
+    """
+    Pager for keyset-paginated lists: only the first, last and neighbouring pages, so that
+    every page is loaded from an already known id. Hidden when there is a single page.
+    """
+    return Row(
+        FirstPage(scroll=scroll),
+        PrevPage(scroll=scroll),
+        CurrentPage(scroll=scroll),
+        NextPage(scroll=scroll),
+        LastPage(scroll=scroll),
+        when=F["pages"] > 1,
+    )
+
+
 # Старые константы для обратной совместимости
 back_main_menu_button = (
     Row(
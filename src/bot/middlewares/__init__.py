@@ -6,11 +6,13 @@ from .access import AccessMiddleware
 from .channel import ChannelMiddleware
 from .error import ErrorMiddleware
 from .garbage import GarbageMiddleware
+from .latency import setup_latency_metrics
 from .rules import RulesMiddleware
 from .throttling import ThrottlingMiddleware
 from .user import UserMiddleware
 
 __all__ = [
+    "setup_latency_metrics",
     "setup_middlewares",
 ]
 
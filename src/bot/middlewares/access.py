@@ -10,6 +10,7 @@ from src.core.enums import MiddlewareEventType
 from src.services.access import AccessService
 
 from .base import EventTypedMiddleware
+from .context import UpdateContext
 
 
 class AccessMiddleware(EventTypedMiddleware):
@@ -29,8 +30,14 @@ class AccessMiddleware(EventTypedMiddleware):
 
         container: AsyncContainer = data[CONTAINER_KEY]
         access_service: AccessService = await container.get(AccessService)
-
-        if not await access_service.is_access_allowed(aiogram_user=aiogram_user, event=event):
+        context = await UpdateContext.resolve(data, aiogram_user)
+
+        if not await access_service.is_access_allowed(
+            aiogram_user=aiogram_user,
+            event=event,
+            user=context.user,
+            settings=context.settings,
+        ):
             return
 
         return await handler(event, data)
@@ -1,3 +1,4 @@
+import time
 from abc import ABC, abstractmethod
 from typing import Any, Awaitable, Callable, ClassVar, Final, Optional
 
@@ -7,6 +8,7 @@ from aiogram.types import User as AiogramUser
 from loguru import logger
 
 from src.core.enums import MiddlewareEventType
+from src.core.utils.latency import latency_recorder
 
 DEFAULT_UPDATE_TYPES: Final[list[MiddlewareEventType]] = [
     MiddlewareEventType.MESSAGE,
@@ -23,8 +25,26 @@ class EventTypedMiddleware(BaseMiddleware, ABC):
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
-        result = await self.middleware_logic(handler, event, data)
-        return result
+        if not latency_recorder.enabled:
+            return await self.middleware_logic(handler, event, data)
+
+        # Record the middleware's own time, without the rest of the chain it awaits
+        downstream = 0.0
+
+        async def timed_handler(event: TelegramObject, data: dict[str, Any]) -> Any:
+            nonlocal downstream
+            started = time.perf_counter()
+            try:
+                return await handler(event, data)
+            finally:
+                downstream += time.perf_counter() - started
+
+        started = time.perf_counter()
+        try:
+            return await self.middleware_logic(timed_handler, event, data)
+        finally:
+            elapsed = time.perf_counter() - started - downstream
+            latency_recorder.observe("middleware", type(self).__name__, elapsed)
 
     def setup_inner(self, router: Router) -> None:
         for event_type in self.__event_types__:
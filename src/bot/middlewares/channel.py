@@ -1,7 +1,6 @@
 import traceback
 from typing import Any, Awaitable, Callable, Union
 
-from aiogram import Bot
 from aiogram.enums import ChatMemberStatus
 from aiogram.types import CallbackQuery, Message, TelegramObject
 from aiogram.utils.formatting import Text
@@ -9,20 +8,15 @@ from dishka import AsyncContainer
 from loguru import logger
 
 from src.bot.keyboards import CALLBACK_CHANNEL_CONFIRM, get_channel_keyboard, get_user_keyboard
-from src.core.constants import CONTAINER_KEY, USER_KEY
+from src.core.constants import CONTAINER_KEY, UPDATE_CONTEXT_KEY, USER_KEY
 from src.core.enums import MiddlewareEventType
 from src.core.utils.message_payload import MessagePayload
 from src.infrastructure.database.models.dto import UserDto
+from src.services.channel import ALLOWED_STATUSES, ChannelService
 from src.services.notification import NotificationService
-from src.services.settings import SettingsService
 
 from .base import EventTypedMiddleware
-
-ALLOWED_STATUSES = (
-    ChatMemberStatus.CREATOR,
-    ChatMemberStatus.ADMINISTRATOR,
-    ChatMemberStatus.MEMBER,
-)
+from .context import UpdateContext
 
 
 class ChannelMiddleware(EventTypedMiddleware):
@@ -36,26 +30,20 @@ class ChannelMiddleware(EventTypedMiddleware):
     ) -> Any:
         container: AsyncContainer = data[CONTAINER_KEY]
         user: UserDto = data[USER_KEY]
-        settings_service: SettingsService = await container.get(SettingsService)
+        context: UpdateContext = data[UPDATE_CONTEXT_KEY]
+        settings = context.settings
 
-        if not await settings_service.is_channel_required():
+        if not settings.channel_required:
             return await handler(event, data)
 
         if user.is_privileged:
             logger.debug(f"User '{user.telegram_id}' skipped channel check (privileged)")
             return await handler(event, data)
 
-        bot: Bot = await container.get(Bot)
-        notification_service: NotificationService = await container.get(NotificationService)
-
-        settings = await settings_service.get()
+        channel_service: ChannelService = await container.get(ChannelService)
 
-        chat_id: Union[str, int, None] = None
         channel_link = settings.channel_link.get_secret_value()
-        if settings.channel_has_username:
-            chat_id = channel_link
-        elif settings.channel_id:
-            chat_id = settings.channel_id
+        chat_id: Union[str, int, None] = await channel_service.get_chat_id(settings)
 
         if chat_id is None:
             logger.warning(
@@ -64,15 +52,18 @@ class ChannelMiddleware(EventTypedMiddleware):
             return await handler(event, data)
 
         try:
-            member = await bot.get_chat_member(
+            # A confirm click must see a fresh status, everything else may use the cache
+            status = await channel_service.get_member_status(
                 chat_id=chat_id,
                 user_id=user.telegram_id,
+                force=self._is_click_confirm(event),
             )
         except Exception as exception:
             traceback_str = traceback.format_exc()
             error_type_name = type(exception).__name__
             error_message = Text(str(exception)[:512])
 
+            notification_service = await container.get(NotificationService)
             await notification_service.error_notify(
                 error_id=user.telegram_id,
                 traceback_str=traceback_str,
@@ -91,14 +82,16 @@ class ChannelMiddleware(EventTypedMiddleware):
             )
             return await handler(event, data)
 
-        if member.status in ALLOWED_STATUSES:
+        if status in ALLOWED_STATUSES:
             if self._is_click_confirm(event):
                 await self._delete_channel_message(event)
 
-            logger.debug(f"User '{user.telegram_id}' passed channel check. Status: {member.status}")
+            logger.debug(f"User '{user.telegram_id}' passed channel check. Status: {status}")
             # TODO: Auto confirming
             return await handler(event, data)
 
+        notification_service = await container.get(NotificationService)
+
         if self._is_click_confirm(event):
             await self._delete_channel_message(event)
             await notification_service.notify_user(
@@ -113,7 +106,7 @@ class ChannelMiddleware(EventTypedMiddleware):
             logger.debug(f"User '{user.telegram_id}' failed channel check")
             return
 
-        if member.status == ChatMemberStatus.LEFT:
+        if status == ChatMemberStatus.LEFT:
             i18n_key = "ntf-channel-join-required-left"
         else:
             i18n_key = "ntf-channel-join-required"
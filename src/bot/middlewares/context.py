@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from aiogram.types import User as AiogramUser
+from dishka import AsyncContainer
+
+from src.core.constants import CONTAINER_KEY, UPDATE_CONTEXT_KEY
+from src.infrastructure.database.models.dto import SettingsDto, UserDto
+from src.services.settings import SettingsService
+from src.services.user import UserService
+
+
+@dataclass
+class UpdateContext:
+    """
+    User and settings snapshot of one update, resolved by the first middleware that needs
+    it and kept in `data` under `UPDATE_CONTEXT_KEY`. Later middlewares and handlers read
+    it instead of fetching again; whoever replaces the user must update `user` as well.
+    """
+
+    telegram_id: int
+    user: Optional[UserDto]
+    settings: SettingsDto
+
+    @classmethod
+    async def resolve(cls, data: dict[str, Any], aiogram_user: AiogramUser) -> "UpdateContext":
+        context: Optional[UpdateContext] = data.get(UPDATE_CONTEXT_KEY)
+        if context is not None and context.telegram_id == aiogram_user.id:
+            return context
+
+        container: AsyncContainer = data[CONTAINER_KEY]
+        user_service: UserService = await container.get(UserService)
+        settings_service: SettingsService = await container.get(SettingsService)
+
+        context = cls(
+            telegram_id=aiogram_user.id,
+            user=await user_service.get(telegram_id=aiogram_user.id),
+            settings=await settings_service.get(),
+        )
+        data[UPDATE_CONTEXT_KEY] = context
+        return context
@@ -1,9 +1,12 @@
 from typing import Any, Awaitable, Callable, cast
 
 from aiogram.types import Message, TelegramObject
+from dishka import AsyncContainer
 from loguru import logger
+from redis.asyncio import Redis
 
-from src.core.constants import USER_KEY
+from src.bot.deletion import schedule_message_deletion
+from src.core.constants import CONTAINER_KEY, USER_KEY
 from src.core.enums import Command, MiddlewareEventType
 from src.infrastructure.database.models.dto import UserDto
 
@@ -23,7 +26,16 @@ class GarbageMiddleware(EventTypedMiddleware):
         user: UserDto = data[USER_KEY]
 
         if message.text != f"/{Command.START.value.command}":
-            await message.delete()
-            logger.debug(f"Message '{message.content_type}' deleted from '{user.telegram_id}'")
+            container: AsyncContainer = data[CONTAINER_KEY]
+            redis_client: Redis = await container.get(Redis)
+            # Deleted in the background, batched with other deletions in the chat
+            try:
+                await schedule_message_deletion(redis_client, message.chat.id, message.message_id)
+            except Exception as exception:
+                logger.warning(f"Failed to schedule message deletion: {exception}")
+                await message.delete()
+            logger.debug(
+                f"Message '{message.content_type}' from '{user.telegram_id}' sent for deletion"
+            )
 
         return await handler(event, data)
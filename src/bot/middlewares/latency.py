@@ -0,0 +1,82 @@
+from typing import Any, Awaitable, Callable, Iterator
+
+from aiogram import Router
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject
+from aiogram_dialog import Dialog
+from aiogram_dialog.api.protocols import DialogManager
+from loguru import logger
+
+from src.core.enums import MiddlewareEventType
+from src.core.utils.latency import latency_recorder, measure_latency
+
+from .base import EventTypedMiddleware
+
+DataGetter = Callable[..., Awaitable[dict[str, Any]]]
+
+
+class HandlerLatencyMiddleware(EventTypedMiddleware):
+    __event_types__ = [MiddlewareEventType.MESSAGE, MiddlewareEventType.CALLBACK_QUERY]
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        # Inner middleware: the awaited handler is all there is to measure
+        return await self.middleware_logic(handler, event, data)
+
+    async def middleware_logic(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_object: HandlerObject = data["handler"]
+        callback = handler_object.callback
+        name = f"{callback.__module__}.{getattr(callback, '__qualname__', repr(callback))}"
+
+        with measure_latency("handler", name):
+            return await handler(event, data)
+
+
+class TimedGetter:
+    getter: DataGetter
+    name: str
+
+    def __init__(self, getter: DataGetter, name: str) -> None:
+        self.getter = getter
+        self.name = name
+
+    async def __call__(self, dialog_manager: DialogManager, **kwargs: Any) -> dict[str, Any]:
+        with measure_latency("getter", self.name):
+            return await self.getter(dialog_manager=dialog_manager, **kwargs)
+
+
+def _iter_dialogs(router: Router) -> Iterator[Dialog]:
+    if isinstance(router, Dialog):
+        yield router
+
+    for sub_router in router.sub_routers:
+        yield from _iter_dialogs(sub_router)
+
+
+def setup_latency_metrics(router: Router) -> None:
+    """
+    Enable latency recording: middlewares time themselves through `EventTypedMiddleware`,
+    handlers are timed by an inner middleware and every dialog window getter is wrapped.
+    Must run after the routers are included.
+    """
+    latency_recorder.enabled = True
+    HandlerLatencyMiddleware().setup_inner(router=router)
+
+    getters = 0
+    for dialog in _iter_dialogs(router):
+        dialog.getter = TimedGetter(dialog.getter, f"{dialog.states_group_name()}:*")
+        for state, window in dialog.windows.items():
+            getter = window.getter  # type: ignore[attr-defined]
+            window.getter = TimedGetter(getter, str(state.state))  # type: ignore[attr-defined]
+            getters += 1
+
+    logger.info(f"Latency metrics enabled, '{getters}' window getters instrumented")
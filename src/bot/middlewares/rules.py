@@ -4,15 +4,15 @@ from aiogram.types import CallbackQuery, Message, TelegramObject
 from dishka import AsyncContainer
 
 from src.bot.keyboards import CALLBACK_RULES_ACCEPT, get_rules_keyboard
-from src.core.constants import CONTAINER_KEY, USER_KEY
+from src.core.constants import CONTAINER_KEY, UPDATE_CONTEXT_KEY, USER_KEY
 from src.core.enums import MiddlewareEventType
 from src.core.utils.message_payload import MessagePayload
 from src.infrastructure.database.models.dto import UserDto
 from src.services.notification import NotificationService
-from src.services.settings import SettingsService
 from src.services.user import UserService
 
 from .base import EventTypedMiddleware
+from .context import UpdateContext
 
 
 class RulesMiddleware(EventTypedMiddleware):
@@ -26,23 +26,21 @@ class RulesMiddleware(EventTypedMiddleware):
     ) -> Any:
         container: AsyncContainer = data[CONTAINER_KEY]
         user: UserDto = data[USER_KEY]
-        settings_service: SettingsService = await container.get(SettingsService)
+        context: UpdateContext = data[UPDATE_CONTEXT_KEY]
+        settings = context.settings
 
-        if not await settings_service.is_rules_required():
+        if not settings.rules_required:
             return await handler(event, data)
 
-        user_service: UserService = await container.get(UserService)
-        notification_service: NotificationService = await container.get(NotificationService)
-
-        settings = await settings_service.get()
-
         if self._is_click_accept(event):
+            user_service: UserService = await container.get(UserService)
             user.is_rules_accepted = True
             await user_service.update(user)
             await self._delete_rules_message(event)
             return await handler(event, data)
 
         if not user.is_rules_accepted:
+            notification_service: NotificationService = await container.get(NotificationService)
             await notification_service.notify_user(
                 user=user,
                 payload=MessagePayload(
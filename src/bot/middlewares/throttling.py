@@ -1,14 +1,17 @@
 from typing import Any, Awaitable, Callable
 
-from aiogram.types import TelegramObject
-from cachetools import TTLCache
+from aiogram.types import CallbackQuery, TelegramObject
 from dishka import AsyncContainer
 from loguru import logger
+from redis.asyncio import Redis
 
+from src.core.config import AppConfig
 from src.core.constants import CONTAINER_KEY, USER_KEY
 from src.core.enums import MiddlewareEventType
+from src.core.storage.keys import ThrottlingKey, ThrottlingNoticeKey
 from src.core.utils.message_payload import MessagePayload
 from src.infrastructure.database.models.dto import UserDto
+from src.infrastructure.redis import RateLimit, consume_token, throttling_stats
 from src.services.notification import NotificationService
 
 from .base import EventTypedMiddleware
@@ -17,9 +20,6 @@ from .base import EventTypedMiddleware
 class ThrottlingMiddleware(EventTypedMiddleware):
     __event_types__ = [MiddlewareEventType.MESSAGE, MiddlewareEventType.CALLBACK_QUERY]
 
-    def __init__(self, ttl: float = 0.05) -> None:
-        self.cache: TTLCache[int, Any] = TTLCache(maxsize=2_000, ttl=ttl)
-
     async def middleware_logic(
         self,
         handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
@@ -29,15 +29,55 @@ class ThrottlingMiddleware(EventTypedMiddleware):
         container: AsyncContainer = data[CONTAINER_KEY]
         user: UserDto = data[USER_KEY]
 
-        notification_service: NotificationService = await container.get(NotificationService)
+        config: AppConfig = await container.get(AppConfig)
+        redis_client: Redis = await container.get(Redis)
+
+        event_type = self._get_event_type(event)
+        counters = throttling_stats.get(event_type)
+
+        try:
+            allowed, notify = await consume_token(
+                redis=redis_client,
+                bucket_key=ThrottlingKey(event_type=event_type, user_id=user.telegram_id),
+                notice_key=ThrottlingNoticeKey(user_id=user.telegram_id),
+                limit=self._get_rate_limit(config, event_type),
+                notice_cooldown=config.bot.throttling_notice_cooldown,
+            )
+        except Exception as exception:
+            # Fail open: a Redis outage must not lock users out of the bot
+            counters.failed += 1
+            logger.warning(f"Throttling check for '{user.telegram_id}' failed: {exception}")
+            return await handler(event, data)
+
+        if allowed:
+            counters.allowed += 1
+            return await handler(event, data)
+
+        counters.throttled += 1
+        logger.warning(f"User '{user.telegram_id}' throttled ({event_type})")
 
-        if user.telegram_id in self.cache:
+        if notify:
+            counters.notified += 1
+            notification_service: NotificationService = await container.get(NotificationService)
             await notification_service.notify_user(
                 user=user,
                 payload=MessagePayload(i18n_key="ntf-throttling-many-requests"),
             )
-            logger.warning(f"User '{user.telegram_id}' throttled")
-            return
 
-        self.cache[user.telegram_id] = None
-        return await handler(event, data)
+    @staticmethod
+    def _get_event_type(event: TelegramObject) -> MiddlewareEventType:
+        if isinstance(event, CallbackQuery):
+            return MiddlewareEventType.CALLBACK_QUERY
+        return MiddlewareEventType.MESSAGE
+
+    @staticmethod
+    def _get_rate_limit(config: AppConfig, event_type: MiddlewareEventType) -> RateLimit:
+        if event_type == MiddlewareEventType.CALLBACK_QUERY:
+            return RateLimit(
+                rate=config.bot.throttling_callback_rate,
+                burst=config.bot.throttling_callback_burst,
+            )
+        return RateLimit(
+            rate=config.bot.throttling_message_rate,
+            burst=config.bot.throttling_message_burst,
+        )
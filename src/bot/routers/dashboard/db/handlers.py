@@ -22,6 +22,7 @@ from src.core.utils.formatters import format_user_log as log
 from src.services.notification import NotificationService
 from src.infrastructure.taskiq.tasks.importer import sync_bot_to_panel_task
 from src.infrastructure.redis.repository import RedisRepository
+from src.infrastructure.redis.cache import invalidate_local_cache
 from fluentogram import TranslatorRunner
 
 
@@ -469,6 +470,7 @@ async def on_restore_backup(
             if cache_keys:
                 await redis_client.delete(*cache_keys)
                 logger.info(f"Cleared {len(cache_keys)} cache keys")
+            await invalidate_local_cache(redis_client)
             
             # Применяем миграции базы данных
             logger.info("Step 4: Applying database migrations after restore")
@@ -724,6 +726,7 @@ async def on_db_file_input(
             if cache_keys:
                 await redis_client.delete(*cache_keys)
                 logger.info(f"Cleared {len(cache_keys)} cache keys")
+            await invalidate_local_cache(redis_client)
 
             # Применяем миграции базы данных
             logger.info("Applying database migrations after restore")
@@ -1543,6 +1546,7 @@ async def on_clear_all_confirm(
         if success:
             # Очищаем кэш Redis
             await redis_client.flushall()
+            await invalidate_local_cache(redis_client)
             logger.info(f"{log(user)} Database cleared successfully")
             
             await notification_service.notify_user(
@@ -1666,6 +1670,7 @@ async def on_clear_users_confirm(
         if success:
             # Очищаем кэш Redis
             await redis_client.flushall()
+            await invalidate_local_cache(redis_client)
             logger.info(f"{log(user)} Users cleared successfully")
             
             await notification_service.notify_user(
@@ -1,10 +1,19 @@
 from aiogram_dialog import Dialog, StartMode, Window
 from aiogram_dialog.widgets.input import MessageInput
-from aiogram_dialog.widgets.kbd import Button, Row, ScrollingGroup, Select, Start, SwitchTo
+from aiogram_dialog.widgets.kbd import (
+    Button,
+    Column,
+    Row,
+    ScrollingGroup,
+    Select,
+    Start,
+    StubScroll,
+    SwitchTo,
+)
 from aiogram_dialog.widgets.text import Format
 from magic_filter import F
 
-from src.bot.keyboards import main_menu_button
+from src.bot.keyboards import get_keyset_pager, main_menu_button
 from src.bot.states import Dashboard, DashboardUsers
 from src.bot.widgets import Banner, I18nFormat, IgnoreUpdate
 from src.core.enums import BannerName
@@ -149,7 +158,7 @@ recent_activity = Window(
 all_users = Window(
     Banner(BannerName.DASHBOARD),
     I18nFormat("msg-users-all"),
-    ScrollingGroup(
+    Column(
         Select(
             text=Format("{item.telegram_id} ({item.name})"),
             id="user",
@@ -158,11 +167,9 @@ all_users = Window(
             type_factory=int,
             on_click=on_user_select,
         ),
-        id="scroll",
-        width=1,
-        height=7,
-        hide_on_single_page=True,
     ),
+    StubScroll(id="scroll_all_users", pages="pages"),
+    get_keyset_pager("scroll_all_users"),
     Row(
         SwitchTo(
             text=I18nFormat("btn-back"),
@@ -209,7 +216,7 @@ search_results = Window(
 blacklist = Window(
     Banner(BannerName.DASHBOARD),
     I18nFormat("msg-users-blacklist"),
-    ScrollingGroup(
+    Column(
         Select(
             text=Format("{item.telegram_id} ({item.name})"),
             id="user",
@@ -218,11 +225,9 @@ blacklist = Window(
             type_factory=int,
             on_click=on_user_select,
         ),
-        id="scroll",
-        width=1,
-        height=7,
-        hide_on_single_page=True,
     ),
+    StubScroll(id="scroll_blacklist", pages="pages"),
+    get_keyset_pager("scroll_blacklist"),
     Row(
         Button(
             text=I18nFormat("btn-users-unblock-all"),
@@ -1,9 +1,12 @@
-from typing import Any, cast
+from math import ceil
+from typing import Any, Optional, cast
 
 from aiogram_dialog import DialogManager
+from aiogram_dialog.widgets.common import ManagedScroll
 from dishka import FromDishka
 from dishka.integrations.aiogram_dialog import inject
 
+from src.core.constants import USERS_PAGE_SIZE
 from src.core.utils.formatters import format_percent
 from src.infrastructure.database.models.dto import UserDto
 from src.services.user import UserService
@@ -43,17 +46,68 @@ async def recent_activity_getter(
     return {"recent_activity_users": users}
 
 
+async def _get_users_page(
+    dialog_manager: DialogManager,
+    user_service: UserService,
+    scroll_id: str,
+    total: int,
+    blocked: Optional[bool] = None,
+) -> dict[str, Any]:
+    """
+    The visible page of a `StubScroll` user list. The pager only moves to the first, last or
+    a neighbouring page, and the edge ids of every shown page are kept in `dialog_data`, so
+    each page is a keyset seek from a known id instead of an OFFSET scan.
+    """
+    widget: Optional[ManagedScroll] = dialog_manager.find(scroll_id)
+
+    if not widget:
+        raise ValueError()
+
+    pages = max(ceil(total / USERS_PAGE_SIZE), 1)
+    page = min(await widget.get_page(), pages - 1)
+    bounds: dict[str, list[int]] = dialog_manager.dialog_data.setdefault(f"{scroll_id}_bounds", {})
+    previous, following = bounds.get(str(page - 1)), bounds.get(str(page + 1))
+
+    if page == 0:
+        users = await user_service.get_page(USERS_PAGE_SIZE, blocked=blocked)
+    elif previous:
+        users = await user_service.get_page(USERS_PAGE_SIZE, after=previous[1], blocked=blocked)
+    elif following:
+        users = await user_service.get_page(USERS_PAGE_SIZE, before=following[0], blocked=blocked)
+    elif page == pages - 1:
+        users = await user_service.get_page(
+            total - page * USERS_PAGE_SIZE, from_end=True, blocked=blocked
+        )
+    else:
+        # Bounds from an older list; start over
+        page = 0
+        bounds.clear()
+        await widget.set_page(page)
+        users = await user_service.get_page(USERS_PAGE_SIZE, blocked=blocked)
+
+    if users:
+        bounds[str(page)] = [users[0].telegram_id, users[-1].telegram_id]
+
+    return {
+        "users": users,
+        "pages": pages,
+    }
+
+
 @inject
 async def all_users_getter(
     dialog_manager: DialogManager,
     user_service: FromDishka[UserService],
     **kwargs: Any,
 ) -> dict[str, Any]:
-    """Получает всех пользователей из базы данных."""
-    users = await user_service.get_all()
-    # Сортируем по ID (последние зарегистрированные первые)
-    sorted_users = sorted(users, key=lambda u: u.telegram_id, reverse=True)
-    return {"all_users": sorted_users}
+    """Показывает одну страницу пользователей (последние зарегистрированные первые)."""
+    count_users = await user_service.count()
+    page = await _get_users_page(dialog_manager, user_service, "scroll_all_users", count_users)
+
+    return {
+        "all_users": page["users"],
+        "pages": page["pages"],
+    }
 
 
 @inject
@@ -62,13 +116,21 @@ async def blacklist_getter(
     user_service: FromDishka[UserService],
     **kwargs: Any,
 ) -> dict[str, Any]:
-    blocked_users = await user_service.get_blocked_users()
+    count_blocked = await user_service.count_blocked()
     count_users = await user_service.count()
+    page = await _get_users_page(
+        dialog_manager,
+        user_service,
+        "scroll_blacklist",
+        count_blocked,
+        blocked=True,
+    )
 
     return {
-        "blocked_users_exists": bool(blocked_users),
-        "blocked_users": blocked_users,
-        "count_blocked": len(blocked_users),
+        "blocked_users_exists": bool(count_blocked),
+        "blocked_users": page["users"],
+        "pages": page["pages"],
+        "count_blocked": count_blocked,
         "count_users": count_users,
-        "percent": format_percent(part=len(blocked_users), whole=count_users),
+        "percent": format_percent(part=count_blocked, whole=count_users),
     }
@@ -1,4 +1,5 @@
 from aiogram import Router
+from aiogram.enums import ChatMemberStatus
 from aiogram.filters import JOIN_TRANSITION, LEAVE_TRANSITION, ChatMemberUpdatedFilter
 from aiogram.types import ChatMemberUpdated
 from dishka import FromDishka
@@ -6,6 +7,7 @@ from loguru import logger
 
 from src.core.utils.formatters import format_user_log as log
 from src.infrastructure.database.models.dto import UserDto
+from src.services.channel import ChannelService
 from src.services.user import UserService
 
 # For only ChatType.PRIVATE (app/bot/filters/private.py)
@@ -30,3 +32,16 @@ async def on_blocked(
 ) -> None:
     logger.info(f"{log(user)} Bot blocked")
     await user_service.set_bot_blocked(user=user, blocked=True)
+
+
+@router.chat_member()
+async def on_channel_member_updated(
+    member: ChatMemberUpdated,
+    channel_service: FromDishka[ChannelService],
+) -> None:
+    # Requires the bot to be an administrator of the required channel
+    await channel_service.update_member_status(
+        chat=member.chat,
+        user_id=member.new_chat_member.user.id,
+        status=ChatMemberStatus(member.new_chat_member.status),
+    )
@@ -4,6 +4,7 @@ from pydantic import SecretStr, field_validator
 from pydantic_core.core_schema import FieldValidationInfo
 
 from src.core.constants import API_V1, BOT_WEBHOOK_PATH, URL_PATTERN
+from src.core.enums import UpdateIngestionMode, UpdateOverflowPolicy
 
 from .base import BaseConfig
 from .validators import validate_not_change_me, validate_username
@@ -22,6 +23,25 @@ class BotConfig(BaseConfig, env_prefix="BOT_"):
     setup_commands: bool = True
     use_banners: bool = True
 
+    update_workers: int = 32  # Максимум одновременно обрабатываемых апдейтов
+    update_queue_size: int = 100  # Размер очереди каждого воркера
+    update_overflow_policy: UpdateOverflowPolicy = UpdateOverflowPolicy.WAIT
+    update_ingestion: UpdateIngestionMode = UpdateIngestionMode.DIRECT
+    update_stream_partitions: int = 16  # Не меняйте при работающих процессах
+    update_stream_max_len: int = 100_000
+
+    channel_member_ttl: int = 600  # Сколько помнить, что пользователь подписан на канал (сек)
+    channel_non_member_ttl: int = 60  # Сколько помнить, что пользователь не подписан (сек)
+
+    throttling_message_rate: float = 2.0  # Сообщений в секунду от одного пользователя
+    throttling_message_burst: int = 5  # Допустимая пачка сообщений подряд
+    throttling_callback_rate: float = 5.0  # Нажатий кнопок в секунду от одного пользователя
+    throttling_callback_burst: int = 10  # Допустимая пачка нажатий подряд
+    throttling_notice_cooldown: float = 10  # Не чаще одного предупреждения за период (сек)
+
+    latency_metrics: bool = False  # Замер времени middleware, обработчиков и геттеров
+    latency_log_interval: int = 300  # Как часто писать сводку в лог (сек)
+
     @property
     def webhook_path(self) -> str:
         return f"{API_V1}{BOT_WEBHOOK_PATH}"
@@ -19,6 +19,7 @@ API_V1: Final[str] = "/api/v1"
 BOT_WEBHOOK_PATH: Final[str] = "/telegram"
 PAYMENTS_WEBHOOK_PATH: Final[str] = "/payments"
 REMNAWAVE_WEBHOOK_PATH: Final[str] = "/remnawave"
+METRICS_PATH: Final[str] = "/metrics"
 REPOSITORY: Final[str] = "https://github.com/snoups/remnashop"
 
 TIMEZONE: Final[timezone] = timezone.utc
@@ -35,13 +36,17 @@ CONTAINER_KEY: Final[str] = "dishka_container"
 CONFIG_KEY: Final[str] = "config"
 USER_KEY: Final[str] = "user"
 IS_SUPER_DEV_KEY: Final[str] = "is_super_dev"
+UPDATE_CONTEXT_KEY: Final[str] = "update_context"
 
 TIME_1M: Final[int] = 60
 TIME_5M: Final[int] = TIME_1M * 5
 TIME_10M: Final[int] = TIME_1M * 10
+TIME_1D: Final[int] = TIME_1M * 60 * 24
 
 RECENT_REGISTERED_MAX_COUNT: Final[int] = 25
 RECENT_ACTIVITY_MAX_COUNT: Final[int] = 25
+USERS_PAGE_SIZE: Final[int] = 7
 
 BATCH_SIZE: Final[int] = 20
+STREAM_CHUNK_SIZE: Final[int] = 500
 BATCH_DELAY: Final[int] = 1
@@ -319,6 +319,17 @@ class Locale(StrEnum):
     VI = auto()  # Vietnamese
 
 
+class UpdateOverflowPolicy(UpperStrEnum):
+    WAIT = auto()  # Hold the webhook request until a queue slot frees up
+    DROP = auto()  # Acknowledge and discard the update
+    REJECT = auto()  # Answer 503 so that Telegram redelivers the update later
+
+
+class UpdateIngestionMode(UpperStrEnum):
+    DIRECT = auto()  # Process updates in the process that received the webhook
+    STREAM = auto()  # Append updates to Redis streams shared by all bot processes
+
+
 # https://docs.aiogram.dev/en/latest/api/types/update.html
 class MiddlewareEventType(StrEnum):
     AIOGD_UPDATE = auto()  # AIOGRAM DIALOGS
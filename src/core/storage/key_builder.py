@@ -1,8 +1,19 @@
 from enum import Enum
-from typing import TYPE_CHECKING, Any, ClassVar, Optional
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, SecretStr
+from pydantic import BaseModel, ConfigDict, SecretStr, TypeAdapter
+
+# Annotations whose values `model_dump(mode="json")` returns unchanged
+_PLAIN_ANNOTATIONS: tuple[Any, ...] = (
+    str,
+    int,
+    bool,
+    Optional[str],
+    Optional[int],
+    Optional[bool],
+)
 
 
 def build_key(prefix: str, /, *parts: Any, **kw_parts: Any) -> str:
@@ -10,9 +21,13 @@ def build_key(prefix: str, /, *parts: Any, **kw_parts: Any) -> str:
 
 
 class StorageKey(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     if TYPE_CHECKING:
         __separator__: ClassVar[str]
         __prefix__: ClassVar[Optional[str]]
+        __encoders__: ClassVar[tuple[tuple[str, Callable[[Any], str]], ...]]
+        __static_key__: ClassVar[Optional[str]]
 
     def __init_subclass__(cls, **kwargs: Any) -> None:
         cls.__separator__ = kwargs.pop("separator", ":")
@@ -24,13 +39,28 @@ class StorageKey(BaseModel):
             )
         super().__init_subclass__(**kwargs)
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        # Fields are only known once pydantic has built the model, not in __init_subclass__
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.__encoders__ = tuple(
+            (name, cls._compile_encoder(field.annotation))
+            for name, field in sorted(cls.model_fields.items())
+        )
+        cls.__static_key__ = None if cls.__encoders__ else (cls.__prefix__ or "")
+
     def pack(self) -> str:
+        if self.__static_key__ is not None:
+            return self.__static_key__
+        return self._packed
+
+    @cached_property
+    def _packed(self) -> str:
+        # Keys are frozen, so the packed string is computed once per instance
         result = [self.__prefix__] if self.__prefix__ else []
-        dumped_data = self.model_dump(mode="json")
 
-        for key in sorted(dumped_data.keys()):
-            value = dumped_data[key]
-            encoded = self.encode_value(value)
+        for key, encoder in self.__encoders__:
+            encoded = encoder(getattr(self, key))
             if self.__separator__ in encoded:
                 raise ValueError(
                     f"Separator symbol '{self.__separator__!r}' can not be used "
@@ -39,6 +69,14 @@ class StorageKey(BaseModel):
             result.append(encoded)
         return self.__separator__.join(result)
 
+    @classmethod
+    def _compile_encoder(cls, annotation: Any) -> Callable[[Any], str]:
+        if annotation in _PLAIN_ANNOTATIONS:
+            return cls.encode_value
+
+        type_adapter: TypeAdapter[Any] = TypeAdapter(annotation)
+        return lambda value: cls.encode_value(type_adapter.dump_python(value, mode="json"))
+
     @classmethod
     def encode_value(cls, value: Any) -> str:
         if value is None:
@@ -15,7 +15,28 @@ class SyncRunningKey(StorageKey, prefix="sync_running"): ...
 class AccessWaitListKey(StorageKey, prefix="access_wait_list"): ...
 
 
-class RecentActivityUsersKey(StorageKey, prefix="recent_activity_users"): ...
+class RecentActivityUsersKey(StorageKey, prefix="recent_activity"): ...
 
 
 class ShutdownMessagesKey(StorageKey, prefix="shutdown_messages"): ...
+
+
+class ChannelMemberKey(StorageKey, prefix="channel_member"):
+    chat_id: str
+    user_id: int
+
+
+class ThrottlingKey(StorageKey, prefix="throttling"):
+    event_type: str
+    user_id: int
+
+
+class ThrottlingNoticeKey(StorageKey, prefix="throttling_notice"):
+    user_id: int
+
+
+class RemnawaveImportKey(StorageKey, prefix="remnawave_import"):
+    telegram_id: int
+
+
+class MessageDeletionsKey(StorageKey, prefix="message_deletions"): ...
@@ -0,0 +1,167 @@
+import asyncio
+import bisect
+import time
+from dataclasses import dataclass, field
+from typing import Any, Final, Optional
+
+from loguru import logger
+
+# Upper bounds of the histogram buckets, in milliseconds; the last bucket is unbounded
+LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1_000,
+    2_500,
+    5_000,
+)
+LATENCY_LOG_TOP: Final[int] = 10
+
+
+@dataclass
+class LatencyHistogram:
+    count: int = 0
+    total: float = 0  # ms
+    max: float = 0  # ms
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, capped by the observed max."""
+        if not self.count:
+            return 0
+
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                bound = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+                return min(bound, round(self.max, 3))
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        bounds = [*map(str, LATENCY_BUCKETS), "+Inf"]
+        return {
+            "count": self.count,
+            "sum_ms": round(self.total, 3),
+            "avg_ms": round(self.total / self.count, 3) if self.count else 0,
+            "max_ms": round(self.max, 3),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": dict(zip(bounds, self.buckets)),
+        }
+
+
+class LatencyRecorder:
+    """
+    Process-local wall time histograms of update processing, keyed by kind
+    ("middleware", "handler", "getter") and name. Disabled by default, so that
+    instrumented code paths cost a single attribute check.
+    """
+
+    enabled: bool
+    _series: dict[tuple[str, str], LatencyHistogram]
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._series = {}
+
+    def observe(self, kind: str, name: str, seconds: float) -> None:
+        histogram = self._series.get((kind, name))
+        if histogram is None:
+            histogram = self._series[(kind, name)] = LatencyHistogram()
+        histogram.observe(seconds * 1000)
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, Any]]]:
+        result: dict[str, dict[str, dict[str, Any]]] = {}
+        for (kind, name), histogram in sorted(self._series.items()):
+            result.setdefault(kind, {})[name] = histogram.as_dict()
+        return result
+
+    def summary(self, top: int = LATENCY_LOG_TOP) -> list[str]:
+        """Lines for the series with the largest total time."""
+        ranked = sorted(self._series.items(), key=lambda item: item[1].total, reverse=True)
+        return [
+            f"{kind} '{name}': count={h.count}, avg={h.total / h.count:.1f}ms, "
+            f"p95={h.quantile(0.95)}ms, max={h.max:.1f}ms"
+            for (kind, name), h in ranked[:top]
+        ]
+
+    def reset(self) -> None:
+        self._series.clear()
+
+
+latency_recorder = LatencyRecorder()
+
+
+class LatencyReporter:
+    """Periodically logs the heaviest `latency_recorder` series."""
+
+    recorder: LatencyRecorder
+    interval: float
+    _task: Optional[asyncio.Task[None]]
+
+    def __init__(self, interval: float, recorder: LatencyRecorder = latency_recorder) -> None:
+        self.recorder = recorder
+        self.interval = interval
+        self._task = None
+
+    async def start(self) -> None:
+        if self._task is not None or not self.recorder.enabled:
+            return
+
+        self._task = asyncio.create_task(self._run())
+        logger.debug(f"Latency reporter started (interval={self.interval}s)")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._report()
+        logger.debug("Latency reporter stopped")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self._report()
+
+    def _report(self) -> None:
+        lines = self.recorder.summary()
+        if lines:
+            logger.info("Update latency summary:\n" + "\n".join(lines))
+
+
+class measure_latency:  # noqa: N801
+    """
+    Records the wall time of its block; used only on paths installed while recording
+    is enabled.
+    """
+
+    __slots__ = ("kind", "name", "_started")
+
+    def __init__(self, kind: str, name: str) -> None:
+        self.kind = kind
+        self.name = name
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        self._started = time.perf_counter()
+
+    def __exit__(self, *args: Any) -> None:
+        latency_recorder.observe(self.kind, self.name, time.perf_counter() - self._started)
@@ -0,0 +1,14 @@
+from typing import Any, Callable, Final
+
+from msgspec.msgpack import Decoder, Encoder
+from pydantic import SecretStr
+
+
+def _enc_hook(obj: Any) -> Any:
+    if isinstance(obj, SecretStr):
+        return obj.get_secret_value()
+    raise NotImplementedError(f"Objects of type '{type(obj).__name__}' are not supported")
+
+
+decode: Final[Callable[[bytes], Any]] = Decoder().decode
+encode: Final[Callable[[Any], bytes]] = Encoder(enc_hook=_enc_hook).encode
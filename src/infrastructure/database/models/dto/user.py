@@ -95,9 +95,14 @@ class UserDto(BaseUserDto):
     ) -> Optional["UserDto"]:
         dto = super().from_model(model_instance, decrypt=decrypt)
         if dto and model_instance:
-            dto._has_any_subscription = bool(getattr(model_instance, "subscriptions", []))
-            referral = getattr(model_instance, "referral", None)
-            dto._is_invited_user = bool(referral)
+            # Only what the load profile fetched: relationships left unloaded are `raise`
+            loaded = model_instance.__dict__
+            if "subscriptions" in loaded:
+                dto._has_any_subscription = bool(loaded["subscriptions"])
+            else:
+                dto._has_any_subscription = bool(loaded.get("has_subscriptions"))
+            referral = loaded.get("referral")
+            dto._is_invited_user = bool(referral) or bool(loaded.get("has_referral"))
             
             # Детальное логирование для отладки
             import logging
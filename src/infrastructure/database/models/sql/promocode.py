@@ -85,4 +85,4 @@ class PromocodeActivation(BaseSql):
     )
 
     promocode: Mapped["Promocode"] = relationship("Promocode", back_populates="activations")
-    user: Mapped["User"] = relationship("User", foreign_keys=[user_telegram_id], lazy="selectin")
+    user: Mapped["User"] = relationship("User", foreign_keys=[user_telegram_id], lazy="noload")
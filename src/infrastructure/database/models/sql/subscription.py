@@ -72,12 +72,12 @@ class Subscription(BaseSql, TimestampMixin):
         back_populates="subscriptions",
         primaryjoin="Subscription.user_telegram_id==User.telegram_id",
         foreign_keys="Subscription.user_telegram_id",
-        lazy="selectin",
+        lazy="raise",
     )
     
     extra_device_purchases: Mapped[list["ExtraDevicePurchase"]] = relationship(
         "ExtraDevicePurchase",
         back_populates="subscription",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan",
     )
@@ -9,7 +9,7 @@ if TYPE_CHECKING:
     from .extra_device_purchase import ExtraDevicePurchase
 
 from sqlalchemy import BigInteger, Boolean, DateTime, Enum, ForeignKey, Integer, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 
 from src.core.enums import Locale, UserRole
 
@@ -64,15 +64,18 @@ class User(BaseSql, TimestampMixin):
     current_subscription: Mapped[Optional["Subscription"]] = relationship(
         "Subscription",
         foreign_keys=[current_subscription_id],
-        lazy="selectin",
+        lazy="raise",
     )
+    # Filled by the `with_current_subscription` load profile instead of loading collections
+    has_subscriptions: Mapped[Optional[bool]] = query_expression()
+    has_referral: Mapped[Optional[bool]] = query_expression()
 
     subscriptions: Mapped[list["Subscription"]] = relationship(
         "Subscription",
         back_populates="user",
         primaryjoin="User.telegram_id==Subscription.user_telegram_id",
         foreign_keys="[Subscription.user_telegram_id]",
-        lazy="selectin",
+        lazy="raise",
     )
 
     referral: Mapped[Optional["Referral"]] = relationship(
@@ -80,7 +83,7 @@ class User(BaseSql, TimestampMixin):
         back_populates="referred",
         primaryjoin="User.telegram_id==Referral.referred_telegram_id",
         uselist=False,
-        lazy="selectin",
+        lazy="raise",
     )
     
     extra_device_purchases: Mapped[list["ExtraDevicePurchase"]] = relationship(
@@ -88,5 +91,5 @@ class User(BaseSql, TimestampMixin):
         back_populates="user",
         primaryjoin="User.telegram_id==ExtraDevicePurchase.user_telegram_id",
         foreign_keys="[ExtraDevicePurchase.user_telegram_id]",
-        lazy="selectin",
+        lazy="raise",
     )
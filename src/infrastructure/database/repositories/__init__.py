@@ -1,5 +1,9 @@
+from .base import LoadOptions
 from .facade import RepositoriesFacade
+from .user import UserLoad
 
 __all__ = [
+    "LoadOptions",
     "RepositoriesFacade",
+    "UserLoad",
 ]
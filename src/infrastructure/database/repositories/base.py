@@ -1,9 +1,12 @@
-from typing import Any, Optional, Type, TypeVar, Union, cast
+from typing import Any, AsyncIterator, Optional, Sequence, Type, TypeVar, Union, cast
 
-from sqlalchemy import ColumnExpressionArgument, delete, func, select, update
+from sqlalchemy import ColumnExpressionArgument, delete, func, insert, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.base import ExecutableOption
 
+from src.core.constants import STREAM_CHUNK_SIZE
 from src.infrastructure.database.models.sql import BaseSql
 
 T = TypeVar("T", bound=BaseSql)
@@ -11,6 +14,8 @@ ModelType = Type[T]
 
 ConditionType = ColumnExpressionArgument[Any]
 OrderByArgument = Union[ColumnExpressionArgument[Any], InstrumentedAttribute[Any]]
+# Loader options of a named load profile; relationships are not loaded unless a profile asks
+LoadOptions = Sequence[ExecutableOption]
 
 
 class BaseRepository:
@@ -26,14 +31,49 @@ class BaseRepository:
         return instance
 
     async def create_instances(self, instances: list[T]) -> list[T]:
+        """
+        Insert rows of one model as a bulk INSERT ... RETURNING, which the driver batches
+        into a few multi-row statements. Returns new persistent instances, including
+        server defaults, in input order.
+
+        Unlike `create_instance`, the given instances only supply column values: they are
+        not added to the session and get no primary key, so callers must use the result.
+        """
         if not instances:
             return []
 
-        self.session.add_all(instances)
-        await self.session.flush()
-        for instance in instances:
-            await self.session.refresh(instance)
-        return instances
+        model = type(instances[0])
+        query = insert(model).returning(model, sort_by_parameter_order=True)
+        result = await self.session.scalars(query, [self._column_values(i) for i in instances])
+        return list(result.all())
+
+    async def _upsert(
+        self,
+        model: ModelType[T],
+        rows: list[dict[str, Any]],
+        index_elements: Sequence[InstrumentedAttribute[Any]],
+        update_fields: Sequence[str] = (),
+    ) -> list[T]:
+        """
+        PostgreSQL INSERT ... ON CONFLICT over the unique `index_elements`. Conflicting rows
+        get `update_fields` overwritten with the new values, or are skipped when there are
+        none; only inserted or updated rows are returned.
+        """
+        if not rows:
+            return []
+
+        query = pg_insert(model)
+        if update_fields:
+            query = query.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={field: query.excluded[field] for field in update_fields},
+            )
+        else:
+            query = query.on_conflict_do_nothing(index_elements=index_elements)
+
+        query = query.returning(model).execution_options(populate_existing=True)
+        result = await self.session.scalars(query, rows)
+        return list(result.all())
 
     async def merge_instance(self, instance: T) -> T:
         return await self.session.merge(instance)
@@ -41,8 +81,13 @@ class BaseRepository:
     async def delete_instance(self, instance: T) -> None:
         await self.session.delete(instance)
 
-    async def _get_one(self, model: ModelType[T], *conditions: ConditionType) -> Optional[T]:
-        result = await self.session.execute(select(model).where(*conditions))
+    async def _get_one(
+        self,
+        model: ModelType[T],
+        *conditions: ConditionType,
+        options: LoadOptions = (),
+    ) -> Optional[T]:
+        result = await self.session.execute(select(model).where(*conditions).options(*options))
         return result.unique().scalar_one_or_none()
 
     async def _get_many(
@@ -52,8 +97,9 @@ class BaseRepository:
         order_by: Optional[OrderByArgument] = None,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        options: LoadOptions = (),
     ) -> list[T]:
-        query = select(model).where(*conditions)
+        query = select(model).where(*conditions).options(*options)
 
         if order_by is not None:
             if isinstance(order_by, (list, tuple)):
@@ -70,37 +116,144 @@ class BaseRepository:
         result = await self.session.execute(query)
         return list(result.unique().scalars().all())
 
+    async def stream(
+        self,
+        model: ModelType[T],
+        *conditions: ConditionType,
+        order_by: Optional[OrderByArgument] = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        options: LoadOptions = (),
+    ) -> AsyncIterator[list[T]]:
+        """
+        Scan through a server-side cursor, yielding rows in chunks of `chunk_size`.
+
+        The cursor lives on its own session and connection, so the caller may query and
+        commit through the unit of work between chunks; it also holds a transaction open
+        for the whole scan, so do not stream across slow external calls. Yielded rows
+        belong to the scan session, whose identity map only holds them weakly: convert them
+        to DTOs and drop them. Eager loaders must not join collections (`yield_per` forbids
+        it). A caller that may stop early must `aclose()` the generator (e.g. with
+        `contextlib.aclosing`), otherwise the cursor and connection stay open until GC.
+        """
+        query = (
+            select(model)
+            .where(*conditions)
+            .options(*options)
+            .execution_options(yield_per=chunk_size)
+        )
+
+        if order_by is not None:
+            if isinstance(order_by, (list, tuple)):
+                query = query.order_by(*order_by)
+            else:
+                query = query.order_by(order_by)
+
+        async with AsyncSession(self.session.bind, expire_on_commit=False) as session:
+            result = await session.stream_scalars(query)
+            try:
+                async for rows in result.partitions():
+                    yield list(rows)
+            finally:
+                await result.close()
+
+    async def _get_page(
+        self,
+        model: ModelType[T],
+        *conditions: ConditionType,
+        key: InstrumentedAttribute[Any],
+        limit: int,
+        after: Optional[Any] = None,
+        before: Optional[Any] = None,
+        from_end: bool = False,
+        descending: bool = False,
+        options: LoadOptions = (),
+    ) -> list[T]:
+        """
+        Keyset (seek) pagination over a unique, indexed `key`, in `key` order.
+
+        Returns the `limit` rows right after `after`, right before `before`, or the last
+        `limit` rows when `from_end` is set; without cursors it is the first page. Unlike
+        OFFSET, the cost does not grow with the page number.
+        """
+        query = select(model).where(*conditions).options(*options)
+
+        if after is not None:
+            query = query.where(key < after if descending else key > after)
+
+        backwards = before is not None or from_end
+        if before is not None:
+            query = query.where(key > before if descending else key < before)
+
+        # Walking backwards reads the rows nearest to the cursor first, then restores the order
+        ascending = descending == backwards
+        query = query.order_by(key.asc() if ascending else key.desc()).limit(limit)
+
+        result = await self.session.execute(query)
+        rows = list(result.unique().scalars().all())
+        return rows[::-1] if backwards else rows
+
     async def _update(
         self,
         model: ModelType[T],
         *conditions: ConditionType,
         load_result: bool = True,
+        options: LoadOptions = (),
         **kwargs: Any,
     ) -> Optional[T]:
         if not kwargs:
             if not load_result:
                 return None
-            return cast(Optional[T], await self._get_one(model, *conditions))
+            return cast(Optional[T], await self._get_one(model, *conditions, options=options))
 
         query = update(model).where(*conditions).values(**kwargs)
 
-        if load_result:
-            query = query.returning(model.id)  # type: ignore [attr-defined]
+        if not load_result:
+            await self.session.execute(query)
+            return None
 
+        # RETURNING the whole row maps it straight into the model; the row changed behind
+        # the identity map, so it must overwrite whatever the session holds
+        query = query.returning(model).execution_options(populate_existing=True)
         result = await self.session.execute(query)
-        obj_id: Optional[int] = result.scalar_one_or_none()
+        db_obj: Optional[T] = result.scalar_one_or_none()
 
-        if obj_id is not None and load_result:
-            db_obj = await self.session.get(model, obj_id)
-            await self.session.refresh(db_obj)
+        if db_obj is None or not options:
             return db_obj
 
-        return None
+        # Relationships of a load profile cannot come back from the UPDATE itself
+        query = (
+            select(model)
+            .where(model.id == db_obj.id)  # type: ignore [attr-defined]
+            .options(*options)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(query)
+        return result.unique().scalar_one_or_none()
 
     async def _delete(self, model: ModelType[T], *conditions: ConditionType) -> int:
         result = await self.session.execute(delete(model).where(*conditions))
         return result.rowcount  # type: ignore[attr-defined, no-any-return]
 
+    @staticmethod
+    def _column_values(instance: BaseSql) -> dict[str, Any]:
+        """
+        Column attributes set on a transient instance, keyed as the ORM DML expects. A None
+        primary key or defaulted column is left out, as a flush would leave it to the
+        database instead of inserting NULL.
+        """
+        state = instance.__dict__
+        values: dict[str, Any] = {}
+        for attr in inspect(type(instance)).column_attrs:
+            if attr.key not in state:
+                continue
+
+            column = attr.columns[0]
+            has_default = column.default is not None or column.server_default is not None
+            if state[attr.key] is None and (column.primary_key or has_default):
+                continue
+            values[attr.key] = state[attr.key]
+        return values
+
     async def _count(self, model: Type[T], *conditions: ConditionType) -> int:
         query = select(func.count()).select_from(model).where(*conditions)
         result = await self.session.scalar(query)
@@ -1,8 +1,15 @@
-from typing import Any, Optional
+from typing import Any, Final, Optional
+
+from sqlalchemy.orm import joinedload
 
 from src.infrastructure.database.models.sql import Subscription
 
-from .base import BaseRepository
+from .base import BaseRepository, LoadOptions
+
+
+class SubscriptionLoad:
+    MINIMAL: Final[LoadOptions] = ()
+    WITH_USER: Final[LoadOptions] = (joinedload(Subscription.user),)
 
 
 class SubscriptionRepository(BaseRepository):
@@ -10,16 +17,23 @@ class SubscriptionRepository(BaseRepository):
         return await self.create_instance(subscription)
 
     async def get(self, subscription_id: int) -> Optional[Subscription]:
-        return await self._get_one(Subscription, Subscription.id == subscription_id)
+        return await self._get_one(
+            Subscription, Subscription.id == subscription_id, options=SubscriptionLoad.WITH_USER
+        )
 
     async def get_all_by_user(self, telegram_id: int) -> list[Subscription]:
+        # The owner is already known to the caller
         return await self._get_many(Subscription, Subscription.user_telegram_id == telegram_id)
 
     async def get_all(self) -> list[Subscription]:
-        return await self._get_many(Subscription)
+        return await self._get_many(Subscription, options=SubscriptionLoad.WITH_USER)
 
     async def update(self, subscription_id: int, **data: Any) -> Optional[Subscription]:
         return await self._update(Subscription, Subscription.id == subscription_id, **data)
 
     async def filter_by_plan_id(self, plan_id: int) -> list[Subscription]:
-        return await self._get_many(Subscription, Subscription.plan["id"].as_integer() == plan_id)
+        return await self._get_many(
+            Subscription,
+            Subscription.plan["id"].as_integer() == plan_id,
+            options=SubscriptionLoad.WITH_USER,
+        )
@@ -1,10 +1,17 @@
-from typing import Any, Optional
+from typing import Any, Final, Optional
 from uuid import UUID
 
+from sqlalchemy.orm import joinedload
+
 from src.core.enums import TransactionStatus
 from src.infrastructure.database.models.sql import Transaction
 
-from .base import BaseRepository
+from .base import BaseRepository, LoadOptions
+
+
+class TransactionLoad:
+    MINIMAL: Final[LoadOptions] = ()
+    WITH_USER: Final[LoadOptions] = (joinedload(Transaction.user),)
 
 
 class TransactionRepository(BaseRepository):
@@ -12,16 +19,21 @@ class TransactionRepository(BaseRepository):
         return await self.create_instance(transaction)
 
     async def get(self, payment_id: UUID) -> Optional[Transaction]:
-        return await self._get_one(Transaction, Transaction.payment_id == payment_id)
+        return await self._get_one(
+            Transaction, Transaction.payment_id == payment_id, options=TransactionLoad.WITH_USER
+        )
 
     async def get_by_user(self, telegram_id: int) -> list[Transaction]:
+        # The owner is already known to the caller
         return await self._get_many(Transaction, Transaction.user_telegram_id == telegram_id)
 
     async def get_all(self) -> list[Transaction]:
-        return await self._get_many(Transaction)
+        return await self._get_many(Transaction, options=TransactionLoad.WITH_USER)
 
     async def get_by_status(self, status: TransactionStatus) -> list[Transaction]:
-        return await self._get_many(Transaction, Transaction.status == status)
+        return await self._get_many(
+            Transaction, Transaction.status == status, options=TransactionLoad.WITH_USER
+        )
 
     async def update(self, payment_id: UUID, **data: Any) -> Optional[Transaction]:
         return await self._update(Transaction, Transaction.payment_id == payment_id, **data)
@@ -1,22 +1,62 @@
-from typing import Any, Optional
+from typing import Any, Final, Optional
 
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import joinedload, with_expression
 
 from src.core.enums import UserRole
-from src.infrastructure.database.models.sql import User
-
-from .base import BaseRepository
+from src.infrastructure.database.models.sql import Referral, Subscription, User
+
+from .base import BaseRepository, LoadOptions
+
+
+class UserLoad:
+    """
+    Load profiles for `User`. Relationships are `raise` by default, so every query states
+    what it needs; `WITH_CURRENT_SUBSCRIPTION` is what `UserDto` is built from.
+    """
+
+    MINIMAL: Final[LoadOptions] = ()
+    # One SELECT: the current subscription is joined, the `UserDto` flags are EXISTS columns
+    WITH_CURRENT_SUBSCRIPTION: Final[LoadOptions] = (
+        joinedload(User.current_subscription),
+        with_expression(
+            User.has_subscriptions,
+            select(Subscription.id)
+            .where(Subscription.user_telegram_id == User.telegram_id)
+            .exists(),
+        ),
+        with_expression(
+            User.has_referral,
+            select(Referral.id).where(Referral.referred_telegram_id == User.telegram_id).exists(),
+        ),
+    )
 
 
 class UserRepository(BaseRepository):
     async def create(self, user: User) -> User:
         return await self.create_instance(user)
 
-    async def get(self, telegram_id: int) -> Optional[User]:
-        return await self._get_one(User, User.telegram_id == telegram_id)
-
-    async def get_by_ids(self, telegram_ids: list[int]) -> list[User]:
-        return await self._get_many(User, User.telegram_id.in_(telegram_ids))
+    async def create_many(self, users: list[User]) -> list[User]:
+        """Insert users in one statement, skipping ids that already exist; returns the new."""
+        return await self._upsert(
+            User,
+            [self._column_values(user) for user in users],
+            index_elements=[User.telegram_id],
+        )
+
+    async def get(
+        self,
+        telegram_id: int,
+        load: LoadOptions = UserLoad.WITH_CURRENT_SUBSCRIPTION,
+    ) -> Optional[User]:
+        return await self._get_one(User, User.telegram_id == telegram_id, options=load)
+
+    async def get_by_ids(
+        self,
+        telegram_ids: list[int],
+        load: LoadOptions = UserLoad.WITH_CURRENT_SUBSCRIPTION,
+    ) -> list[User]:
+        return await self._get_many(User, User.telegram_id.in_(telegram_ids), options=load)
 
     async def get_by_partial_name(self, query: str) -> list[User]:
         search_pattern = f"%{query.lower()}%"
@@ -24,21 +64,58 @@ class UserRepository(BaseRepository):
             func.lower(User.name).like(search_pattern),
             func.lower(User.username).like(search_pattern),
         ]
-        return await self._get_many(User, or_(*conditions))
+        return await self._get_many(
+            User, or_(*conditions), options=UserLoad.WITH_CURRENT_SUBSCRIPTION
+        )
 
     async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by exact username (case-insensitive)."""
-        return await self._get_one(User, func.lower(User.username) == username.lower())
+        return await self._get_one(
+            User,
+            func.lower(User.username) == username.lower(),
+            options=UserLoad.WITH_CURRENT_SUBSCRIPTION,
+        )
 
     async def get_by_referral_code(self, referral_code: str) -> Optional[User]:
-        from sqlalchemy import func
-        return await self._get_one(User, func.lower(User.referral_code) == referral_code.lower())
-
-    async def get_all(self) -> list[User]:
-        return await self._get_many(User)
-
-    async def update(self, telegram_id: int, **data: Any) -> Optional[User]:
-        return await self._update(User, User.telegram_id == telegram_id, **data)
+        return await self._get_one(
+            User,
+            func.lower(User.referral_code) == referral_code.lower(),
+            options=UserLoad.WITH_CURRENT_SUBSCRIPTION,
+        )
+
+    async def get_all(self, load: LoadOptions = UserLoad.WITH_CURRENT_SUBSCRIPTION) -> list[User]:
+        return await self._get_many(User, options=load)
+
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        from_end: bool = False,
+        blocked: Optional[bool] = None,
+        load: LoadOptions = UserLoad.MINIMAL,
+    ) -> list[User]:
+        """Users by descending `telegram_id`, the dashboard lists' order, paged by it."""
+        conditions = [] if blocked is None else [User.is_blocked == blocked]
+        return await self._get_page(
+            User,
+            *conditions,
+            key=User.telegram_id,
+            limit=limit,
+            after=after,
+            before=before,
+            from_end=from_end,
+            descending=True,
+            options=load,
+        )
+
+    async def update(
+        self,
+        telegram_id: int,
+        load: LoadOptions = UserLoad.MINIMAL,
+        **data: Any,
+    ) -> Optional[User]:
+        return await self._update(User, User.telegram_id == telegram_id, options=load, **data)
 
     async def delete(self, telegram_id: int) -> bool:
         return bool(await self._delete(User, User.telegram_id == telegram_id))
@@ -46,8 +123,15 @@ class UserRepository(BaseRepository):
     async def count(self) -> int:
         return await self._count(User)
 
+    async def count_by_blocked(self, blocked: bool) -> int:
+        return await self._count(User, User.is_blocked == blocked)
+
     async def filter_by_role(self, role: UserRole) -> list[User]:
-        return await self._get_many(User, User.role == role)
+        return await self._get_many(
+            User, User.role == role, options=UserLoad.WITH_CURRENT_SUBSCRIPTION
+        )
 
     async def filter_by_blocked(self, blocked: bool) -> list[User]:
-        return await self._get_many(User, User.is_blocked == blocked)
+        return await self._get_many(
+            User, User.is_blocked == blocked, options=UserLoad.WITH_CURRENT_SUBSCRIPTION
+        )
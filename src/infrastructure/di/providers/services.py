@@ -3,6 +3,7 @@ from dishka import Provider, Scope, provide
 from src.services.access import AccessService
 from src.services.balance_transfer import BalanceTransferService
 from src.services.broadcast import BroadcastService
+from src.services.channel import ChannelService
 from src.services.command import CommandService
 from src.services.extra_device import ExtraDeviceService
 from src.services.importer import ImporterService
@@ -41,3 +42,4 @@ class ServicesProvider(Provider):
     importer_service = provide(source=ImporterService)
     referral_service = provide(source=ReferralService, scope=Scope.REQUEST)
     extra_device_service = provide(source=ExtraDeviceService, scope=Scope.REQUEST)
+    channel_service = provide(source=ChannelService, scope=Scope.REQUEST)
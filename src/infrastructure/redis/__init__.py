@@ -1,7 +1,28 @@
-from .cache import redis_cache
+from .activity import ActivityFlusher, activity_buffer, write_activity
+from .cache import (
+    get_many_cached,
+    invalidate_cache,
+    invalidate_local_cache,
+    invalidate_tags,
+    redis_cache,
+)
+from .local_cache import CacheInvalidationListener, local_cache
 from .repository import RedisRepository
+from .throttling import RateLimit, consume_token, throttling_stats
 
 __all__ = [
+    "ActivityFlusher",
+    "activity_buffer",
+    "CacheInvalidationListener",
+    "consume_token",
+    "get_many_cached",
+    "invalidate_cache",
+    "invalidate_local_cache",
+    "invalidate_tags",
+    "local_cache",
+    "RateLimit",
     "redis_cache",
     "RedisRepository",
+    "throttling_stats",
+    "write_activity",
 ]
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from typing import Any, Final, Optional
+
+from loguru import logger
+from redis.asyncio import Redis
+
+ACTIVITY_FLUSH_INTERVAL: Final[float] = 0.3
+
+
+class ActivityBuffer:
+    """
+    Process-local write-behind buffer for "last seen" sorted sets.
+
+    Repeated touches of a member collapse into its latest timestamp until the next flush,
+    which writes every pending key in one pipeline (ZADD + trim by rank). Stays disabled
+    until an `ActivityFlusher` is running, so callers must write through when `touch`
+    returns False.
+    """
+
+    enabled: bool
+    _pending: dict[str, dict[str, float]]
+    _limits: dict[str, int]
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._pending = {}
+        self._limits = {}
+
+    def touch(self, key: str, member: Any, max_count: int) -> bool:
+        if not self.enabled:
+            return False
+
+        self._pending.setdefault(key, {})[str(member)] = time.time()
+        self._limits[key] = max_count
+        return True
+
+    def discard(self, key: str, member: Any) -> None:
+        self._pending.get(key, {}).pop(str(member), None)
+
+    async def flush(self, redis: Redis) -> None:
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, mapping in pending.items():
+                    if mapping:
+                        write_activity(pipe, key, mapping, self._limits[key])
+                await pipe.execute()
+        except Exception:
+            # Put the batch back, touches made meanwhile are newer and win
+            for key, mapping in pending.items():
+                self._pending[key] = {**mapping, **self._pending.get(key, {})}
+            raise
+
+        logger.debug(f"Activity flushed: {sum(map(len, pending.values()))} members")
+
+
+def write_activity(pipe: Any, key: str, mapping: dict[str, float], max_count: int) -> None:
+    pipe.zadd(key, mapping)
+    pipe.zremrangebyrank(key, 0, -max_count - 1)
+
+
+activity_buffer = ActivityBuffer()
+
+
+class ActivityFlusher:
+    """Periodically flushes `activity_buffer` to Redis."""
+
+    redis: Redis
+    buffer: ActivityBuffer
+    interval: float
+    _task: Optional[asyncio.Task[None]]
+
+    def __init__(
+        self,
+        redis: Redis,
+        buffer: ActivityBuffer = activity_buffer,
+        interval: float = ACTIVITY_FLUSH_INTERVAL,
+    ) -> None:
+        self.redis = redis
+        self.buffer = buffer
+        self.interval = interval
+        self._task = None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+
+        self.buffer.enabled = True
+        self._task = asyncio.create_task(self._run())
+        logger.debug("Activity flusher started")
+
+    async def stop(self) -> None:
+        self.buffer.enabled = False
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        try:
+            await self.buffer.flush(self.redis)
+        except Exception as exception:
+            logger.warning(f"Final activity flush failed: {exception}")
+        logger.debug("Activity flusher stopped")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.buffer.flush(self.redis)
+            except Exception as exception:
+                logger.warning(f"Activity flush failed: {exception}")
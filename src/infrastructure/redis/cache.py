@@ -1,70 +1,541 @@
-from functools import wraps
-from typing import Any, Awaitable, Callable, Optional, ParamSpec, TypeVar, get_type_hints
+import asyncio
+import time
+from datetime import timedelta
+from functools import lru_cache, wraps
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Final,
+    Generic,
+    NamedTuple,
+    Optional,
+    ParamSpec,
+    Sequence,
+    TypeVar,
+    cast,
+    get_args,
+    get_type_hints,
+)
+from uuid import uuid4
 
 from loguru import logger
-from pydantic import SecretStr, TypeAdapter
+from msgspec.msgpack import Decoder
+from pydantic import BaseModel, TypeAdapter
 from redis.asyncio import Redis
 from redis.typing import ExpiryT
 
 from src.core.constants import TIME_1M
-from src.core.utils import json_utils
+from src.core.utils import msgpack_utils
+
+from .local_cache import CACHE_FLUSH_ALL, local_cache, publish_invalidation
 
 T = TypeVar("T", bound=Any)
+K = TypeVar("K")
 P = ParamSpec("P")
 
+LOCK_POLL_INTERVAL: Final[float] = 0.05
+CACHE_TAG_PREFIX: Final[str] = "cache_tag"
 
-def prepare_for_cache(obj: Any) -> Any:
-    if isinstance(obj, SecretStr):
-        return obj.get_secret_value()
-    elif isinstance(obj, dict):
-        return {k: prepare_for_cache(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [prepare_for_cache(v) for v in obj]
-    return obj
+# The lock is only released by the holder that set it, never after it expired and moved on
+_RELEASE_LOCK_SCRIPT: Final[str] = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
 
+# One pending recomputation per cache key in this process; followers await its payload
+_inflight: dict[str, asyncio.Future[Optional[bytes]]] = {}
+_refresh_tasks: set[asyncio.Task[None]] = set()
 
-def redis_cache(
-    prefix: Optional[str] = None,
+
+class CacheRead(NamedTuple):
+    value: Optional[bytes]
+    is_stale: bool
+    versions: Optional[list[str]]
+
+
+def _contains_model(tp: Any) -> bool:
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        return True
+    return any(_contains_model(arg) for arg in get_args(tp))
+
+
+@lru_cache
+def build_loader(return_type: Any) -> Callable[[bytes], Any]:
+    # msgspec would treat pydantic models as plain classes, so DTOs are validated by pydantic
+    if not _contains_model(return_type):
+        try:
+            return Decoder(return_type).decode
+        except TypeError:
+            pass
+
+    type_adapter: TypeAdapter[Any] = TypeAdapter(return_type)
+    return lambda raw: type_adapter.validate_python(msgpack_utils.decode(raw))
+
+
+def dump_payload(type_adapter: TypeAdapter[Any], value: Any) -> bytes:
+    """The cached form of `value`, read back by the `build_loader` of the same type."""
+    return msgpack_utils.encode(type_adapter.dump_python(value))
+
+
+async def invalidate_cache(redis: Redis, *keys: str) -> None:
+    if not keys:
+        return
+
+    local_cache.delete(*keys)
+    await redis.delete(*keys)
+    await publish_invalidation(redis, *keys)
+
+
+async def invalidate_local_cache(redis: Redis) -> None:
+    local_cache.clear()
+    await publish_invalidation(redis, CACHE_FLUSH_ALL)
+
+
+async def invalidate_tags(redis: Redis, *tags: str) -> None:
+    """Invalidate every entry cached with any of `tags` by moving the tags to a new version."""
+    if not tags:
+        return
+
+    version = uuid4().hex
+    await redis.mset({_tag_key(tag): version for tag in tags})
+    logger.debug(f"Cache tags invalidated: {list(tags)}")
+
+
+async def get_many_cached(
+    redis: Redis,
+    prefix: str,
+    ids: Sequence[K],
+    value_type: Any,
+    load_missing: Callable[[list[K]], Awaitable[dict[K, T]]],
     ttl: ExpiryT = TIME_1M,
-) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
-    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+    negative_ttl: Optional[int] = None,
+) -> dict[K, T]:
+    """
+    Bulk counterpart of a single-argument `redis_cache` method with the same `prefix`.
+
+    Reads every entry with one MGET, loads all misses with one `load_missing` call and
+    backfills them in one pipeline. Ids missing from `load_missing` result are left out of
+    the returned mapping and cached as None (for `negative_ttl` if set), like the
+    single-item method would do.
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    if not unique_ids:
+        return {}
+
+    keys = {item_id: ":".join(["cache", prefix, str(item_id)]) for item_id in unique_ids}
+    value_type = Optional[value_type]
+    type_adapter: TypeAdapter[Any] = TypeAdapter(value_type)
+    load = build_loader(value_type)
+
+    found: dict[K, T] = {}
+    missing: list[K] = []
+    try:
+        payloads = await redis.mget(list(keys.values()))
+    except Exception as exception:
+        logger.warning(f"Cache bulk read failed for prefix '{prefix}': {exception}")
+        payloads = [None] * len(unique_ids)
+
+    for item_id, payload in zip(unique_ids, payloads):
+        if payload is None:
+            missing.append(item_id)
+            continue
+        try:
+            value = load(payload)
+        except Exception as exception:
+            logger.warning(f"Cache read failed for key '{keys[item_id]}': {exception}")
+            missing.append(item_id)
+            continue
+        if value is not None:
+            found[item_id] = value
+
+    logger.debug(
+        f"Cache bulk read '{prefix}': {len(unique_ids) - len(missing)} hits, {len(missing)} misses"
+    )
+    if not missing:
+        return found
+
+    loaded = await load_missing(missing)
+    found.update(loaded)
+
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for item_id in missing:
+                value = loaded.get(item_id)
+                payload = dump_payload(type_adapter, value)
+                entry_ttl = negative_ttl if value is None and negative_ttl else ttl
+                pipe.setex(keys[item_id], entry_ttl, payload)
+            await pipe.execute()
+    except Exception as exception:
+        logger.warning(f"Cache bulk write failed for prefix '{prefix}': {exception}")
+
+    return found
+
+
+def _tag_key(tag: str) -> str:
+    return f"{CACHE_TAG_PREFIX}:{tag}"
+
+
+async def _get_tag_versions(redis: Redis, tags: tuple[str, ...]) -> list[str]:
+    versions: list[str] = []
+    for tag, version in zip(tags, await redis.mget([_tag_key(tag) for tag in tags])):
+        if version is None:
+            # Never reuse a default version: entries stamped before an eviction must not match
+            new_version = uuid4().hex
+            version = await redis.set(_tag_key(tag), new_version, nx=True, get=True)
+            versions.append(version.decode() if version else new_version)
+        else:
+            versions.append(version.decode())
+    return versions
+
+
+async def _try_lock(redis: Redis, key: str, ttl: float) -> Optional[str]:
+    """
+    Return the token of the acquired lock, or None if another process holds it.
+    An empty token means Redis failed and the caller recomputes without a lock.
+    """
+    token = uuid4().hex
+    try:
+        if await redis.set(key, token, nx=True, px=int(ttl * 1000)):
+            return token
+        return None
+    except Exception as exception:
+        # Without Redis there is nobody to wait for, so recompute locally
+        logger.warning(f"Cache lock failed for key '{key}', recomputing unlocked: {exception}")
+        return ""
+
+
+async def _release_lock(redis: Redis, key: str, token: str) -> None:
+    try:
+        await redis.eval(_RELEASE_LOCK_SCRIPT, 1, key, token)
+    except Exception as exception:
+        logger.warning(f"Cache lock release failed for key '{key}': {exception}")
+
+
+async def _wait_for_value(
+    key: str,
+    read: Callable[[], Awaitable[CacheRead]],
+    timeout: float,
+) -> Optional[bytes]:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        try:
+            value = (await read()).value
+        except Exception as exception:
+            logger.warning(f"Cache read failed for key '{key}': {exception}")
+            return None
+        if value is not None:
+            return value
+    return None
+
+
+class _CachedMethod(Generic[T]):
+    """The cache policy of one `redis_cache` method and the steps serving a call through it."""
+
+    def __init__(
+        self,
+        func: Callable[..., Awaitable[T]],
+        prefix: Optional[str],
+        ttl: ExpiryT,
+        local_ttl: Optional[float],
+        lock_ttl: Optional[float],
+        stale_ttl: Optional[int],
+        negative_ttl: Optional[int],
+        tags: tuple[str, ...],
+    ) -> None:
+        self.func = func
+        self.prefix = prefix or func.__name__
+        self.local_ttl = local_ttl
+        self.lock_ttl = lock_ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.tags = tags
+
+        self.hard_ttl: ExpiryT = ttl
+        if stale_ttl and isinstance(ttl, timedelta):
+            self.hard_ttl = ttl + timedelta(seconds=stale_ttl)
+        elif stale_ttl:
+            self.hard_ttl = ttl + stale_ttl
+
+        self.negative_hard_ttl: ExpiryT = self.hard_ttl
+        if negative_ttl:
+            self.negative_hard_ttl = negative_ttl + (stale_ttl or 0)
+
         return_type: Any = get_type_hints(func)["return"]
-        type_adapter: TypeAdapter[T] = TypeAdapter(return_type)
+        self.type_adapter: TypeAdapter[T] = TypeAdapter(return_type)
+        self.load = cast(Callable[[bytes], T], build_loader(return_type))
 
-        @wraps(func)
-        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            self: Any = args[0]
-            redis: Redis = self.redis_client
-
-            # Build cache key
-            key_parts = [
-                "cache",
-                prefix or func.__name__,
-                *map(str, args[1:]),
-                *map(str, kwargs.values()),
-            ]
-            key: str = ":".join(key_parts)
+    async def __call__(self, *args: Any, **kwargs: Any) -> T:
+        service: Any = args[0]
+        redis: Redis = service.redis_client
+        key = ":".join(["cache", self.prefix, *map(str, args[1:]), *map(str, kwargs.values())])
+
+        if self.local_ttl:
+            local_value = local_cache.get(key)
+            if local_value is not None:
+                try:
+                    logger.debug(f"Local cache hit: '{key}'")
+                    return self.load(local_value)
+                except Exception as exception:
+                    local_cache.delete(key)
+                    logger.warning(f"Local cache read failed for key '{key}': {exception}")
+
+        versions: Optional[list[str]] = None
+        try:
+            cached_value, is_stale, versions = await self.read(redis, key)
+            if cached_value is not None:
+                logger.debug(f"Cache hit: '{key}'")
+                cached_result = self.load(cached_value)
+                if self.local_ttl:
+                    self.store_local(key, cached_value, cached_result)
+                if is_stale:
+                    self.schedule_refresh(redis, key, args, kwargs)
+                return cached_result
+        except Exception as exception:
+            logger.warning(f"Cache read failed for key '{key}': {exception}")
+
+        inflight = _inflight.get(key)
+        if inflight is not None:
+            logger.debug(f"Cache miss: '{key}'. Joining in-flight call")
+            payload = await asyncio.shield(inflight)
+            if payload is not None:
+                return self.load(payload)
+            return await self.func(*args, **kwargs)
+
+        return await self.lead(redis, key, args, kwargs, versions)
+
+    def store_local(self, key: str, payload: bytes, result: T) -> None:
+        # A None payload is a negative entry and must not outlive `negative_ttl` locally
+        entry_local_ttl = cast(float, self.local_ttl)
+        if result is None and self.negative_ttl:
+            entry_local_ttl = min(entry_local_ttl, self.negative_ttl)
+        local_cache.set(key, payload, entry_local_ttl)
+
+    async def read(self, redis: Redis, key: str) -> CacheRead:
+        if not self.stale_ttl and not self.tags:
+            return CacheRead(await redis.get(key), False, None)
+
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.mget([key, f"{key}:stamp", *map(_tag_key, self.tags)])
+            if self.stale_ttl:
+                pipe.pttl(key)
+            responses = await pipe.execute()
+
+        value, stamp, *raw_versions = responses[0]
+        is_stale = False
+        if self.stale_ttl:
+            is_stale = 0 < responses[-1] <= self.stale_ttl * 1000
+
+        if not self.tags:
+            return CacheRead(value, is_stale, None)
 
+        if None in raw_versions:
+            return CacheRead(None, False, None)
+
+        versions = [version.decode() for version in raw_versions]
+        if stamp is None or stamp.decode() != ",".join(versions):
+            return CacheRead(None, False, versions)
+        return CacheRead(value, is_stale, versions)
+
+    async def store(
+        self,
+        redis: Redis,
+        key: str,
+        result: T,
+        versions: Optional[list[str]],
+    ) -> Optional[bytes]:
+        if self.tags and versions is None:
+            return None
+
+        try:
+            payload = dump_payload(self.type_adapter, result)
+            entry_ttl = self.hard_ttl if result is not None else self.negative_hard_ttl
+
+            if self.tags:
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.setex(key, entry_ttl, payload)
+                    pipe.setex(f"{key}:stamp", entry_ttl, ",".join(cast(list[str], versions)))
+                    await pipe.execute()
+            else:
+                await redis.setex(key, entry_ttl, payload)
+            logger.debug(f"Result cached: '{key}' (ttl={entry_ttl}, stale_ttl={self.stale_ttl})")
+
+            if self.local_ttl:
+                self.store_local(key, payload, result)
+                await publish_invalidation(redis, key)
+            return payload
+        except Exception as exception:
+            logger.warning(f"Cache write failed for key '{key}': {exception}")
+            return None
+
+    async def lead(
+        self,
+        redis: Redis,
+        key: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        versions: Optional[list[str]],
+    ) -> T:
+        # Recompute on behalf of every caller of this key in the process
+        future: asyncio.Future[Optional[bytes]] = asyncio.get_running_loop().create_future()
+        _inflight[key] = future
+
+        try:
+            filled = cast(
+                tuple[T, Optional[bytes]],
+                await self.fill(redis, key, args, kwargs, versions),
+            )
+            result, payload = filled
+            future.set_result(payload)
+            return result
+        finally:
+            if not future.done():
+                future.set_result(None)
+            if _inflight.get(key) is future:
+                del _inflight[key]
+
+    async def fill(
+        self,
+        redis: Redis,
+        key: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        versions: Optional[list[str]] = None,
+        wait: bool = True,
+    ) -> Optional[tuple[T, Optional[bytes]]]:
+        lock_key = f"{key}:lock"
+        lock_token: Optional[str] = ""
+
+        if self.tags and versions is None:
+            # Read before computing so that a concurrent bump outdates this result at once
             try:
-                cached_value: Optional[bytes] = await redis.get(key)
-                if cached_value is not None:
-                    logger.debug(f"Cache hit: '{key}'")
-                    parsed = json_utils.decode(cached_value.decode())
-                    return type_adapter.validate_python(parsed)
+                versions = await _get_tag_versions(redis, self.tags)
             except Exception as exception:
-                logger.warning(f"Cache read failed for key '{key}': {exception}")
+                logger.warning(f"Cache tags read failed for key '{key}': {exception}")
+
+        if self.lock_ttl:
+            lock_token = await _try_lock(redis, lock_key, self.lock_ttl)
+            if lock_token is None:
+                if not wait:
+                    return None
 
+                waited = await self.wait_for_holder(redis, key, self.lock_ttl)
+                if waited is not None:
+                    return waited
+
+        try:
             logger.debug(f"Cache miss: '{key}'. Executing function")
-            result: T = await func(*args, **kwargs)
+            result: T = await self.func(*args, **kwargs)
+            return result, await self.store(redis, key, result, versions)
+        finally:
+            if lock_token:
+                await _release_lock(redis, lock_key, lock_token)
 
-            try:
-                safe_result = prepare_for_cache(type_adapter.dump_python(result))
-                await redis.setex(key, ttl, json_utils.encode(safe_result))
-                logger.debug(f"Result cached: '{key}' (ttl={ttl})")
-            except Exception as exception:
-                logger.warning(f"Cache write failed for key '{key}': {exception}")
+    async def wait_for_holder(
+        self,
+        redis: Redis,
+        key: str,
+        timeout: float,
+    ) -> Optional[tuple[T, Optional[bytes]]]:
+        logger.debug(f"Cache miss: '{key}'. Waiting for another process")
+        payload = await _wait_for_value(key, lambda: self.read(redis, key), timeout)
+        if payload is None:
+            return None
 
-            return result
+        result = self.load(payload)
+        if self.local_ttl:
+            self.store_local(key, payload, result)
+        return result, payload
+
+    def schedule_refresh(
+        self,
+        redis: Redis,
+        key: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> None:
+        if key in _inflight:
+            return
+
+        future: asyncio.Future[Optional[bytes]] = asyncio.get_running_loop().create_future()
+        _inflight[key] = future
+
+        task = asyncio.create_task(self.refresh(redis, key, future, args, kwargs))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+        logger.debug(f"Cache stale: '{key}'. Refresh scheduled")
+
+    async def refresh(
+        self,
+        redis: Redis,
+        key: str,
+        future: asyncio.Future[Optional[bytes]],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> None:
+        service: Any = args[0]
+        try:
+            async with service.detached() as detached:
+                filled = await self.fill(redis, key, (detached, *args[1:]), kwargs, wait=False)
+                future.set_result(filled[1] if filled else None)
+        except Exception as exception:
+            logger.warning(f"Background cache refresh failed for key '{key}': {exception}")
+        finally:
+            if not future.done():
+                future.set_result(None)
+            if _inflight.get(key) is future:
+                del _inflight[key]
+
+
+def redis_cache(
+    prefix: Optional[str] = None,
+    ttl: ExpiryT = TIME_1M,
+    local_ttl: Optional[float] = None,
+    lock_ttl: Optional[float] = None,
+    stale_ttl: Optional[int] = None,
+    negative_ttl: Optional[int] = None,
+    tags: tuple[str, ...] = (),
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """
+    Cache the decorated service method in Redis.
+
+    Concurrent misses for the same key inside one process are coalesced into a single call.
+    With `lock_ttl`, a short Redis lock extends this across processes: only the lock holder
+    recomputes while the others poll for its result for up to `lock_ttl` seconds.
+
+    With `stale_ttl`, `ttl` becomes the soft TTL and entries are kept for `stale_ttl` more
+    seconds. A hit inside that window is returned as is while the value is recomputed in
+    the background. The request keeps its own storage session, so the service must provide
+    `detached()`: an async context manager yielding a copy of it on a session of its own.
+
+    None results are cached like any other value, or for `negative_ttl` seconds if set.
+    Keep it short: the negative entry must be invalidated when the object is created.
+
+    With `tags`, each entry is stamped with the current versions of its tags and is treated
+    as a miss once any of them is bumped by `invalidate_tags`. Stamps live in Redis only,
+    so tags can not be combined with the local tier.
+    """
+    if tags and local_ttl:
+        raise ValueError("Cache tags can not be combined with the local cache tier")
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        cached = _CachedMethod(
+            cast(Callable[..., Awaitable[T]], func),
+            prefix=prefix,
+            ttl=ttl,
+            local_ttl=local_ttl,
+            lock_ttl=lock_ttl,
+            stale_ttl=stale_ttl,
+            negative_ttl=negative_ttl,
+            tags=tags,
+        )
+
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            return await cached(*args, **kwargs)
 
         return wrapper
 
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Final, Optional
+from uuid import uuid4
+
+from loguru import logger
+from redis.asyncio import Redis
+
+from src.core.utils import json_utils
+
+CACHE_INVALIDATION_CHANNEL: Final[str] = "cache_invalidation"
+CACHE_FLUSH_ALL: Final[str] = "*"
+LOCAL_CACHE_MAX_SIZE: Final[int] = 1024
+LISTENER_RETRY_DELAY: Final[int] = 1
+
+
+class LocalCache:
+    """
+    Process-local LRU tier in front of Redis.
+
+    Stores raw cached payloads (not DTO instances), so every hit produces a fresh object
+    and callers may mutate it without corrupting the cache. Stays disabled until
+    a `CacheInvalidationListener` is subscribed, otherwise entries could outlive
+    writes made by other processes.
+    """
+
+    origin: str
+    maxsize: int
+    enabled: bool
+    _entries: OrderedDict[str, tuple[float, bytes]]
+
+    def __init__(self, maxsize: int = LOCAL_CACHE_MAX_SIZE) -> None:
+        self.origin = uuid4().hex
+        self.maxsize = maxsize
+        self.enabled = False
+        self._entries = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        if not self.enabled:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+local_cache = LocalCache()
+
+
+async def publish_invalidation(redis: Redis, *keys: str) -> None:
+    message = json_utils.encode({"origin": local_cache.origin, "keys": list(keys)})
+    await redis.publish(CACHE_INVALIDATION_CHANNEL, message)
+
+
+class CacheInvalidationListener:
+    """Evicts `local_cache` entries invalidated by other processes via Redis pub/sub."""
+
+    redis: Redis
+    cache: LocalCache
+    _task: Optional[asyncio.Task[None]]
+
+    def __init__(self, redis: Redis, cache: LocalCache = local_cache) -> None:
+        self.redis = redis
+        self.cache = cache
+        self._task = None
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+
+        self._task = asyncio.create_task(self._listen())
+        logger.debug(f"Local cache invalidation listener started (origin={self.cache.origin})")
+
+    async def stop(self) -> None:
+        self.cache.enabled = False
+        self.cache.clear()
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        logger.debug("Local cache invalidation listener stopped")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                    # Anything published while we were not subscribed is lost
+                    self.cache.clear()
+                    self.cache.enabled = True
+
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                logger.warning(f"Local cache invalidation listener failed: {exception}")
+
+            self.cache.enabled = False
+            self.cache.clear()
+            await asyncio.sleep(LISTENER_RETRY_DELAY)
+
+    def _handle(self, data: Any) -> None:
+        try:
+            payload = json_utils.decode(data)
+        except Exception as exception:
+            logger.warning(f"Malformed cache invalidation message '{data!r}': {exception}")
+            return
+
+        if payload.get("origin") == self.cache.origin:
+            return
+
+        keys: list[str] = payload.get("keys", [])
+        if CACHE_FLUSH_ALL in keys:
+            self.cache.clear()
+            logger.debug("Local cache flushed by remote invalidation")
+            return
+
+        self.cache.delete(*keys)
+        logger.debug(f"Local cache evicted by remote invalidation: {keys}")
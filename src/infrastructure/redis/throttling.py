@@ -0,0 +1,98 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Final
+
+from redis.asyncio import Redis
+from redis.exceptions import NoScriptError
+
+from src.core.storage.key_builder import StorageKey
+
+# Refills the bucket by elapsed time, takes one token and, when the event is throttled,
+# arms the notice cooldown. Uses the server clock, so all processes share one timeline.
+# Returns {allowed, notify}.
+_TOKEN_BUCKET_SCRIPT: Final[str] = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('time')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local bucket = redis.call('hmget', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = burst
+    ts = now
+end
+
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+
+redis.call('hset', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('pexpire', KEYS[1], math.ceil(burst / rate * 1000))
+
+if allowed == 1 then
+    return {1, 0}
+end
+if redis.call('set', KEYS[2], 1, 'NX', 'PX', ARGV[3]) then
+    return {0, 1}
+end
+return {0, 0}
+"""
+_TOKEN_BUCKET_SHA: Final[str] = hashlib.sha1(_TOKEN_BUCKET_SCRIPT.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rate: float  # Tokens refilled per second
+    burst: int  # Bucket capacity
+
+
+@dataclass
+class ThrottlingCounters:
+    allowed: int = 0
+    throttled: int = 0
+    notified: int = 0
+    failed: int = 0
+
+
+@dataclass
+class ThrottlingStats:
+    """Process-local throttling counters, per event type."""
+
+    events: dict[str, ThrottlingCounters] = field(default_factory=dict)
+
+    def get(self, event_type: str) -> ThrottlingCounters:
+        counters = self.events.get(event_type)
+        if counters is None:
+            counters = self.events[event_type] = ThrottlingCounters()
+        return counters
+
+
+throttling_stats = ThrottlingStats()
+
+
+async def consume_token(
+    redis: Redis,
+    bucket_key: StorageKey,
+    notice_key: StorageKey,
+    limit: RateLimit,
+    notice_cooldown: float,
+) -> tuple[bool, bool]:
+    """
+    Take a token from a Redis token bucket in one round trip.
+    Returns (allowed, notify): `notify` is True for the first throttled event per cooldown.
+    """
+    keys = (bucket_key.pack(), notice_key.pack())
+    args = (limit.rate, limit.burst, max(1, int(notice_cooldown * 1000)))
+
+    try:
+        result = await redis.evalsha(_TOKEN_BUCKET_SHA, len(keys), *keys, *args)  # type: ignore[misc]
+    except NoScriptError:
+        result = await redis.eval(_TOKEN_BUCKET_SCRIPT, len(keys), *keys, *args)  # type: ignore[misc]
+
+    allowed, notify = result
+    return bool(allowed), bool(notify)
@@ -1,19 +1,26 @@
 import traceback
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 from dishka.integrations.taskiq import FromDishka, inject
 from loguru import logger
+from redis.asyncio import Redis
 from remnapy import RemnawaveSDK
 from remnapy.exceptions import BadRequestError
 from remnapy.models import CreateUserRequestDto, UserResponseDto, UpdateUserRequestDto
 
 from src.core.config import AppConfig
-from src.core.storage.keys import SyncRunningKey
+from src.core.constants import STREAM_CHUNK_SIZE, TIME_1D
+from src.core.storage.keys import RemnawaveImportKey, SyncRunningKey
 from src.core.utils.formatters import format_device_count, format_gb_to_bytes
+from src.core.utils.iterables import chunked
 from src.core.utils.message_payload import MessagePayload
 from src.bot.keyboards import get_user_keyboard
+from src.infrastructure.database.models.dto import UserDto
+from src.infrastructure.database.repositories import UserLoad
 from src.infrastructure.redis.repository import RedisRepository
 from src.infrastructure.taskiq.broker import broker
+from src.infrastructure.taskiq.tasks.redirects import redirect_to_main_menu_task
 from src.services.notification import NotificationService
 from src.services.plan import PlanService
 from src.services.remnawave import RemnawaveService
@@ -80,11 +87,13 @@ async def sync_all_users_from_panel_task(
         if len(response.users) < size:
             break
 
-    bot_users = await user_service.get_all()
-    bot_users_map = {user.telegram_id: user for user in bot_users}
+    # Only membership is checked below, so keep ids rather than every user
+    bot_user_ids: set[int] = set()
+    async for bot_users in user_service.stream_all(load=UserLoad.MINIMAL):
+        bot_user_ids.update(user.telegram_id for user in bot_users)
 
     logger.info(f"Total users in panel: '{len(all_remna_users)}'")
-    logger.info(f"Total users in bot: '{len(bot_users)}'")
+    logger.info(f"Total users in bot: '{len(bot_user_ids)}'")
 
     added_users = 0
     added_subscription = 0
@@ -93,19 +102,22 @@ async def sync_all_users_from_panel_task(
     missing_telegram = 0
 
     try:
+        # Missing bot users are inserted in batches; `sync_user` then only syncs subscriptions
+        await _create_missing_users(user_service, all_remna_users, bot_user_ids)
+
         for remna_user in all_remna_users:
             try:
                 if not remna_user.telegram_id:
                     missing_telegram += 1
                     continue
 
-                user = bot_users_map.get(remna_user.telegram_id)
-
-                if not user:
+                if remna_user.telegram_id not in bot_user_ids:
                     await remnawave_service.sync_user(remna_user)
                     added_users += 1
                 else:
-                    current_subscription = await subscription_service.get_current(user.telegram_id)
+                    current_subscription = await subscription_service.get_current(
+                        remna_user.telegram_id
+                    )
                     if not current_subscription:
                         await remnawave_service.sync_user(remna_user)
                         added_subscription += 1
@@ -121,7 +133,7 @@ async def sync_all_users_from_panel_task(
 
         result = {
             "total_panel_users": len(all_remna_users),
-            "total_bot_users": len(bot_users),
+            "total_bot_users": len(bot_user_ids),
             "added_users": added_users,
             "added_subscription": added_subscription,
             "updated": updated,
@@ -135,6 +147,46 @@ async def sync_all_users_from_panel_task(
         await redis_repository.delete(key)
 
 
+async def _create_missing_users(
+    user_service: UserService,
+    remna_users: list[UserResponseDto],
+    bot_user_ids: set[int],
+) -> None:
+    new_remna_users = [
+        remna_user
+        for remna_user in remna_users
+        if remna_user.telegram_id and remna_user.telegram_id not in bot_user_ids
+    ]
+
+    for batch in chunked(new_remna_users, STREAM_CHUNK_SIZE):
+        try:
+            await user_service.create_many_from_panel(batch)
+        except Exception as exception:
+            # The users of a failed batch are created one by one by `sync_user`
+            logger.exception(f"Error creating '{len(batch)}' users from panel: {exception}")
+
+
+async def _iter_users(user_service: UserService) -> AsyncIterator[UserDto]:
+    """
+    Every bot user, one keyset page per query. Unlike `UserService.stream_all`, no cursor
+    or transaction stays open while the caller waits on the panel API between pages.
+    """
+    after: Optional[int] = None
+    while True:
+        users = await user_service.get_page(
+            limit=STREAM_CHUNK_SIZE,
+            after=after,
+            load=UserLoad.WITH_CURRENT_SUBSCRIPTION,
+        )
+        if not users:
+            return
+
+        for user in users:
+            yield user
+
+        after = users[-1].telegram_id
+
+
 @broker.task(retry_on_error=False)
 @inject
 async def sync_bot_to_panel_task(
@@ -207,10 +259,10 @@ async def sync_bot_to_panel_task(
     # ========== ШАГ 2: Синхронизация пользователей ==========
     logger.info("Step 2: Syncing users from bot to Remnawave panel")
     
-    # Получаем всех пользователей бота с подписками
-    bot_users = await user_service.get_all()
-    logger.info(f"Total users in bot: '{len(bot_users)}'")
+    # Пользователи читаются из БД частями по мере обработки, а не списком целиком
+    logger.info(f"Total users in bot: '{await user_service.count()}'")
     
+    total_bot_users = 0
     created = 0
     updated = 0
     errors = 0
@@ -219,7 +271,8 @@ async def sync_bot_to_panel_task(
     error_users: dict[str, str] = {}  # {user_info: error_reason}
     skipped_users: list[str] = []
     
-    for user in bot_users:
+    async for user in _iter_users(user_service):
+        total_bot_users += 1
         try:
             # Получаем текущую подписку пользователя
             subscription = await subscription_service.get_current(user.telegram_id)
@@ -526,7 +579,7 @@ async def sync_bot_to_panel_task(
                 )
     
     result = {
-        "total_bot_users": len(bot_users),
+        "total_bot_users": total_bot_users,
         "created": created,
         "updated": updated,
         "skipped": skipped,
@@ -538,3 +591,27 @@ async def sync_bot_to_panel_task(
     logger.info(f"Sync bot to panel completed: {result}")
     return result
 
+
+@broker.task(retry_on_error=False)
+@inject
+async def import_remnawave_user_task(
+    user: UserDto,
+    redis_client: FromDishka[Redis],
+    remnawave_service: FromDishka[RemnawaveService],
+) -> None:
+    # One import per telegram id, even if the job is enqueued or delivered twice
+    key = RemnawaveImportKey(telegram_id=user.telegram_id)
+    if not await redis_client.set(key.pack(), 1, nx=True, ex=TIME_1D):
+        logger.debug(f"Remnawave import for user '{user.telegram_id}' already done, skipping")
+        return
+
+    try:
+        imported = await remnawave_service.import_existing_user(user)
+    except Exception as exception:
+        await redis_client.delete(key.pack())
+        logger.error(f"Error checking existing Remnawave subscription: {exception}")
+        return
+
+    if imported:
+        # Show the imported subscription in place of the menu opened by the first update
+        await redirect_to_main_menu_task.kiq(user.telegram_id)
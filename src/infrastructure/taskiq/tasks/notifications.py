@@ -46,8 +46,9 @@ async def send_access_opened_notifications_task(
     notification_service: FromDishka[NotificationService],
 ) -> None:
     for batch in chunked(waiting_user_ids, BATCH_SIZE):
+        users = await user_service.get_many(batch)
         for user_telegram_id in batch:
-            user = await user_service.get(user_telegram_id)
+            user = users.get(user_telegram_id)
             await notification_service.notify_user(
                 user=user,
                 payload=MessagePayload(
@@ -614,6 +614,10 @@ async def check_expired_extra_devices_task(
     
     logger.info(f"[check_expired_extra_devices] Found {len(expired_purchases)} expired purchases")
     
+    users = await user_service.get_many(
+        [purchase.user_telegram_id for purchase in expired_purchases]
+    )
+    
     for purchase in expired_purchases:
         try:
             # Получаем подписку
@@ -624,7 +628,7 @@ async def check_expired_extra_devices_task(
                 continue
             
             # Получаем пользователя
-            user = await user_service.get(purchase.user_telegram_id)
+            user = users.get(purchase.user_telegram_id)
             if not user:
                 logger.warning(f"User '{purchase.user_telegram_id}' not found for purchase '{purchase.id}'")
                 await extra_device_service.deactivate(purchase.id)
@@ -1,7 +1,9 @@
-from typing import Any
+from typing import Any, Optional
 
+from dishka import AsyncContainer
 from dishka.integrations.aiogram import setup_dishka as setup_aiogram_dishka
 from dishka.integrations.taskiq import setup_dishka as setup_taskiq_dishka
+from redis.asyncio import Redis
 from taskiq import TaskiqMiddleware
 from taskiq_redis import RedisStreamBroker
 
@@ -9,6 +11,7 @@ from src.bot.dispatcher import create_bg_manager_factory, create_dispatcher, set
 from src.core.config import AppConfig
 from src.core.logger import setup_logger
 from src.infrastructure.di import create_container
+from src.infrastructure.redis.local_cache import CacheInvalidationListener
 from src.infrastructure.taskiq.init import init as init_consumer_group
 
 from .broker import broker
@@ -35,6 +38,27 @@ class DishkaParamsFilterMiddleware(TaskiqMiddleware):
             self.broker.task_hints = filtered_hints
 
 
+class LocalCacheMiddleware(TaskiqMiddleware):
+    """Keeps the worker's local cache tier coherent with the bot process."""
+
+    container: AsyncContainer
+    listener: Optional[CacheInvalidationListener]
+
+    def __init__(self, container: AsyncContainer) -> None:
+        super().__init__()
+        self.container = container
+        self.listener = None
+
+    async def startup(self) -> None:
+        redis_client: Redis = await self.container.get(Redis)
+        self.listener = CacheInvalidationListener(redis_client)
+        await self.listener.start()
+
+    async def shutdown(self) -> None:
+        if self.listener is not None:
+            await self.listener.stop()
+
+
 def worker() -> RedisStreamBroker:
     setup_logger()
 
@@ -52,5 +76,6 @@ def worker() -> RedisStreamBroker:
     
     # Добавляем middleware для фильтрации dishka параметров из task_hints
     broker.add_middlewares(DishkaParamsFilterMiddleware())
+    broker.add_middlewares(LocalCacheMiddleware(container))
 
     return broker
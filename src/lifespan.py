@@ -1,6 +1,7 @@
 import asyncio
 import traceback
 from contextlib import asynccontextmanager
+from functools import partial
 from typing import AsyncGenerator, Optional
 
 from aiogram import Bot, Dispatcher
@@ -10,16 +11,21 @@ from dishka import AsyncContainer, Scope
 from fastapi import FastAPI
 from fluentogram import TranslatorHub
 from loguru import logger
-from redis.asyncio import from_url
+from redis.asyncio import Redis, from_url
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
 from src.__version__ import __version__
 from src.api.endpoints import TelegramWebhookEndpoint
+from src.api.update_stream import UpdateStreamConsumer
+from src.bot.deletion import MessageDeletionSweeper
 from src.core.config.app import AppConfig
 from src.core.enums import SystemNotificationType, UserRole
 from src.core.storage.keys import ShutdownMessagesKey
+from src.core.utils.latency import LatencyReporter
 from src.core.utils.message_payload import MessagePayload
 from src.infrastructure.database import UnitOfWork
+from src.infrastructure.redis.activity import ActivityFlusher
+from src.infrastructure.redis.local_cache import CacheInvalidationListener
 from src.infrastructure.redis.repository import RedisRepository
 from src.services.command import CommandService
 from src.services.notification import NotificationService
@@ -128,6 +134,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     telegram_webhook_endpoint: TelegramWebhookEndpoint = app.state.telegram_webhook_endpoint
     container: AsyncContainer = app.state.dishka_container
 
+    redis_client: Redis = await container.get(Redis)
+    cache_invalidation_listener = CacheInvalidationListener(redis_client)
+    await cache_invalidation_listener.start()
+    activity_flusher = ActivityFlusher(redis_client)
+    await activity_flusher.start()
+
     async with container(scope=Scope.REQUEST) as startup_container:
         config: AppConfig = await startup_container.get(AppConfig)
         webhook_service: WebhookService = await startup_container.get(WebhookService)
@@ -185,8 +197,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     await command_service.setup()
     await telegram_webhook_endpoint.startup()
+    latency_reporter = LatencyReporter(interval=config.bot.latency_log_interval)
+    await latency_reporter.start()
 
     bot: Bot = await container.get(Bot)
+    message_deletion_sweeper = MessageDeletionSweeper(redis_client, bot)
+    await message_deletion_sweeper.start()
+
+    update_stream_consumer: Optional[UpdateStreamConsumer] = None
+    if telegram_webhook_endpoint.update_stream is not None:
+        update_stream_consumer = UpdateStreamConsumer(
+            redis=redis_client,
+            stream=telegram_webhook_endpoint.update_stream,
+            executor=telegram_webhook_endpoint.executor,
+            handle=partial(telegram_webhook_endpoint.feed_raw_update, bot),
+        )
+        await update_stream_consumer.start()
+
     bot_info = await bot.get_me()
     states: dict[Optional[bool], str] = {True: "Enabled", False: "Disabled", None: "Unknown"}
 
@@ -318,8 +345,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         # Set TTL for shutdown messages (24 hours) in case bot doesn't restart
         await redis_repository.expire(shutdown_key, 86400)
 
+    if update_stream_consumer is not None:
+        await update_stream_consumer.stop()
     await telegram_webhook_endpoint.shutdown()
+    await latency_reporter.stop()
+    await message_deletion_sweeper.stop()
     await command_service.delete()
     await webhook_service.delete()
+    await activity_flusher.stop()
+    await cache_invalidation_listener.stop()
 
     await container.close()
@@ -18,6 +18,7 @@ from src.infrastructure.database import UnitOfWork
 from src.infrastructure.database.models.dto import BroadcastDto, BroadcastMessageDto, UserDto
 from src.infrastructure.database.models.sql import Broadcast, BroadcastMessage, Subscription, User
 from src.infrastructure.database.models.sql.plan import Plan
+from src.infrastructure.database.repositories import UserLoad
 from src.infrastructure.redis import RedisRepository
 
 from .base import BaseService
@@ -199,7 +200,10 @@ class BroadcastService(BaseService):
                 and not s.user.is_bot_blocked
             ]
             user_ids = [sub.user_telegram_id for sub in active_subs]
-            db_users = await self.uow.repository.users.get_by_ids(telegram_ids=user_ids)
+            db_users = await self.uow.repository.users.get_by_ids(
+                telegram_ids=user_ids,
+                load=UserLoad.MINIMAL,
+            )
             logger.debug(
                 f"Retrieved '{len(db_users)}' users for audience '{audience}' (plan={plan_id})"
             )
@@ -0,0 +1,101 @@
+from typing import Optional, Union
+
+from aiogram import Bot
+from aiogram.enums import ChatMemberStatus
+from aiogram.types import Chat
+from fluentogram import TranslatorHub
+from loguru import logger
+from redis.asyncio import Redis
+
+from src.core.config import AppConfig
+from src.core.storage.keys import ChannelMemberKey
+from src.infrastructure.database.models.dto import SettingsDto
+from src.infrastructure.redis import RedisRepository
+from src.services.settings import SettingsService
+
+from .base import BaseService
+
+ALLOWED_STATUSES = (
+    ChatMemberStatus.CREATOR,
+    ChatMemberStatus.ADMINISTRATOR,
+    ChatMemberStatus.MEMBER,
+)
+
+
+class ChannelService(BaseService):
+    settings_service: SettingsService
+
+    def __init__(
+        self,
+        config: AppConfig,
+        bot: Bot,
+        redis_client: Redis,
+        redis_repository: RedisRepository,
+        translator_hub: TranslatorHub,
+        #
+        settings_service: SettingsService,
+    ) -> None:
+        super().__init__(config, bot, redis_client, redis_repository, translator_hub)
+        self.settings_service = settings_service
+
+    async def get_chat_id(self, settings: Optional[SettingsDto] = None) -> Union[str, int, None]:
+        settings = settings or await self.settings_service.get()
+        if settings.channel_has_username:
+            return settings.channel_link.get_secret_value()
+        if settings.channel_id:
+            return settings.channel_id
+        return None
+
+    async def get_member_status(
+        self,
+        chat_id: Union[str, int],
+        user_id: int,
+        force: bool = False,
+    ) -> ChatMemberStatus:
+        """
+        Return the user's status in the required channel. Cached statuses are used unless
+        `force` is set, so only cache misses and explicit confirmations call the Bot API.
+        """
+        key = ChannelMemberKey(chat_id=str(chat_id), user_id=user_id)
+
+        if not force:
+            cached = await self.redis_repository.get(key, ChatMemberStatus)
+            if cached is not None:
+                logger.debug(f"Channel member status for '{user_id}' from cache: {cached}")
+                return cached
+
+        member = await self.bot.get_chat_member(chat_id=chat_id, user_id=user_id)
+        status = ChatMemberStatus(member.status)
+        await self._store_status(key, status)
+        return status
+
+    async def update_member_status(
+        self,
+        chat: Chat,
+        user_id: int,
+        status: ChatMemberStatus,
+    ) -> None:
+        """Refresh the cached status from a `chat_member` update of the required channel."""
+        chat_id = await self.get_chat_id()
+        if chat_id is None or not self._is_same_chat(chat, chat_id):
+            return
+
+        key = ChannelMemberKey(chat_id=str(chat_id), user_id=user_id)
+        await self._store_status(key, status)
+        logger.debug(f"Channel member status for '{user_id}' updated: {status}")
+
+    async def _store_status(self, key: ChannelMemberKey, status: ChatMemberStatus) -> None:
+        ttl = (
+            self.config.bot.channel_member_ttl
+            if status in ALLOWED_STATUSES
+            else self.config.bot.channel_non_member_ttl
+        )
+        await self.redis_repository.set(key, value=status, ex=ttl)
+
+    @staticmethod
+    def _is_same_chat(chat: Chat, chat_id: Union[str, int]) -> bool:
+        if isinstance(chat_id, int):
+            return chat.id == chat_id
+
+        username: Optional[str] = chat.username
+        return username is not None and f"@{username}".lower() == chat_id.lower()
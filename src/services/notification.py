@@ -17,6 +17,7 @@ from loguru import logger
 from redis.asyncio import Redis
 
 from src.__version__ import __version__
+from src.bot.deletion import schedule_message_deletion
 from src.bot.keyboards import get_remnashop_keyboard
 from src.bot.states import Notification
 from src.core.config import AppConfig
@@ -168,13 +169,22 @@ class NotificationService(BaseService):
                 sent_message = await self._send_text_message(user, payload, reply_markup)
 
             if payload.auto_delete_after is not None and sent_message:
-                asyncio.create_task(
-                    self._schedule_message_deletion(
+                try:
+                    await schedule_message_deletion(
+                        self.redis_client,
                         chat_id=user.telegram_id,
                         message_id=sent_message.message_id,
                         delay=payload.auto_delete_after,
                     )
-                )
+                except Exception as exception:
+                    logger.warning(f"Failed to schedule message deletion: {exception}")
+                    asyncio.create_task(
+                        self._schedule_message_deletion(
+                            chat_id=user.telegram_id,
+                            message_id=sent_message.message_id,
+                            delay=payload.auto_delete_after,
+                        )
+                    )
 
             return sent_message
 
@@ -11,12 +11,14 @@ from src.infrastructure.database import UnitOfWork
 from src.infrastructure.database.models.dto import PromocodeDto
 from src.infrastructure.database.models.sql import Promocode
 from src.infrastructure.redis import RedisRepository
+from src.services.user import UserService
 
 from .base import BaseService
 
 
 class PromocodeService(BaseService):
     uow: UnitOfWork
+    user_service: UserService
 
     def __init__(
         self,
@@ -27,9 +29,11 @@ class PromocodeService(BaseService):
         translator_hub: TranslatorHub,
         #
         uow: UnitOfWork,
+        user_service: UserService,
     ) -> None:
         super().__init__(config, bot, redis_client, redis_repository, translator_hub)
         self.uow = uow
+        self.user_service = user_service
 
     async def create(self, promocode: PromocodeDto) -> Optional[PromocodeDto]:
         """Создание нового промокода."""
@@ -138,7 +142,7 @@ class PromocodeService(BaseService):
                         )
                     
                     # Очищаем кэш пользователя для обновления данных
-                    await self.redis_client.delete(f"cache:get_user:{activation.user_telegram_id}")
+                    await self.user_service.clear_user_cache(activation.user_telegram_id)
                 
                 # Коммитим изменения скидок пользователей до удаления промокода
                 await self.uow.commit()
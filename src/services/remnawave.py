@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, cast
 from uuid import UUID
 
@@ -35,6 +35,7 @@ from src.core.enums import (
 )
 from src.core.i18n.keys import ByteUnitKey
 from src.core.utils.formatters import (
+    format_bytes_to_gb,
     format_country_code,
     format_days_to_datetime,
     format_device_count,
@@ -49,6 +50,7 @@ from src.core.utils.message_payload import MessagePayload
 from src.core.utils.time import datetime_now
 from src.core.utils.types import RemnaUserDto
 from src.infrastructure.database.models.dto import (
+    PlanDto,
     PlanSnapshotDto,
     RemnaSubscriptionDto,
     SubscriptionDto,
@@ -101,6 +103,211 @@ class RemnawaveService(BaseService):
         if not isinstance(response, GetStatsResponseDto):
             raise ValueError(f"Invalid response from Remnawave panel: {response}")
 
+    async def import_existing_user(self, user: UserDto) -> bool:
+        """
+        Import the subscription a freshly registered user already has in the panel.
+        Returns True when a subscription was imported.
+        """
+        existing_users = await self.remnawave.users.get_users_by_telegram_id(
+            telegram_id=str(user.telegram_id)
+        )
+        if not existing_users:
+            logger.debug(f"User {user.telegram_id} not found in Remnawave")
+            return False
+
+        existing_user = existing_users[0]
+        existing_tag = existing_user.tag
+        logger.debug(
+            f"Found existing Remnawave user {user.telegram_id} "
+            f"with tag='{existing_tag}', status='{existing_user.status}'"
+        )
+
+        if existing_user.status not in ["ACTIVE", "active"]:
+            logger.debug(
+                f"User {user.telegram_id} is not active in Remnawave "
+                f"(status={existing_user.status})"
+            )
+            return False
+
+        if not existing_tag:
+            logger.debug(f"User {user.telegram_id} has no tag in Remnawave")
+            return False
+
+        # Пытаемся найти план по тегу
+        matching_plan = await self.plan_service.get_by_tag(existing_tag)
+        if matching_plan:
+            await self._import_with_plan(user, existing_user, matching_plan)
+        else:
+            await self._import_without_plan(user, existing_user, existing_tag)
+
+        # Инвалидируем кеш пользователя чтобы загрузить актуальные данные с подпиской
+        await self.user_service.clear_user_cache(user.telegram_id)
+        return True
+
+    @staticmethod
+    def _import_duration_days(existing_user: UserResponseDto) -> int:
+        # Вычисляем duration из expire_at
+        if not existing_user.expire_at:
+            return -1  # Безлимит если нет expire_at
+
+        time_left = existing_user.expire_at - datetime.now(timezone.utc)
+        return max(1, time_left.days)  # Минимум 1 день
+
+    async def _import_with_plan(
+        self,
+        user: UserDto,
+        existing_user: UserResponseDto,
+        matching_plan: PlanDto,
+    ) -> None:
+        # План найден, импортируем подписку
+        plan_snapshot = PlanSnapshotDto(
+            id=matching_plan.id,
+            name=matching_plan.name,
+            tag=matching_plan.tag,
+            type=matching_plan.type,
+            traffic_limit=matching_plan.traffic_limit,
+            device_limit=matching_plan.device_limit,
+            duration=self._import_duration_days(existing_user),
+            traffic_limit_strategy=matching_plan.traffic_limit_strategy,
+            internal_squads=matching_plan.internal_squads,
+            external_squad=matching_plan.external_squad,
+        )
+
+        traffic_limit = matching_plan.traffic_limit
+        if existing_user.traffic_limit_bytes:
+            traffic_limit = format_bytes_to_gb(existing_user.traffic_limit_bytes)
+
+        imported_subscription = SubscriptionDto(
+            user_remna_id=existing_user.uuid,
+            status=existing_user.status,
+            is_trial=False,
+            traffic_limit=traffic_limit,
+            device_limit=existing_user.hwid_device_limit or matching_plan.device_limit,
+            traffic_limit_strategy=(
+                existing_user.traffic_limit_strategy or matching_plan.traffic_limit_strategy
+            ),
+            tag=matching_plan.tag,
+            internal_squads=matching_plan.internal_squads,
+            external_squad=matching_plan.external_squad,
+            expire_at=existing_user.expire_at,
+            url=existing_user.subscription_url,
+            plan=plan_snapshot,
+        )
+
+        await self.subscription_service.create(user, imported_subscription)
+
+        # Обновляем device_limit в Remnawave в соответствии с планом бота
+        await self.remnawave.users.update_user(
+            UpdateUserRequestDto(
+                uuid=existing_user.uuid,
+                hwid_device_limit=matching_plan.device_limit,
+            )
+        )
+
+        logger.info(
+            f"Imported existing subscription for user {user.telegram_id} "
+            f"with tag '{matching_plan.tag}' and plan '{matching_plan.name}', "
+            f"updated device_limit to {matching_plan.device_limit}"
+        )
+
+    async def _import_without_plan(
+        self,
+        user: UserDto,
+        existing_user: UserResponseDto,
+        existing_tag: str,
+    ) -> None:
+        # План не найден, создаём подписку с тегом IMPORT_OLDTAG
+        # и сохраняем параметры пользователя (device_limit, expire_at) из Remnawave.
+        # Используем underscore вместо скобок для совместимости с валидацией Remnawave
+        # (pattern: ^[A-Z0-9_]+$)
+
+        # Проверяем, не начинается ли тег уже с IMPORT_
+        # Если да - оставляем как есть, не меняем в Remnawave
+        if existing_tag.startswith("IMPORT_"):
+            # Тег уже в формате IMPORT_xxx - используем его как есть
+            import_tag_remnawave = existing_tag  # Оставляем существующий тег
+            # Извлекаем оригинальный тег для отображения
+            original_tag = existing_tag[7:]  # Убираем "IMPORT_" префикс
+            import_tag_display = f"IMPORT({original_tag})"  # Для отображения в боте
+            should_update_remnawave_tag = False
+        else:
+            # Обычный тег - конвертируем в IMPORT_xxx
+            import_tag_remnawave = f"IMPORT_{existing_tag}"  # Тег для Remnawave API
+            import_tag_display = f"IMPORT({existing_tag})"  # Тег для отображения в боте
+            should_update_remnawave_tag = True
+
+        import_name = "Импорт"  # Название для отображения в профиле
+
+        logger.warning(
+            f"No matching plan found for tag '{existing_tag}' for user {user.telegram_id}. "
+            f"Creating subscription with tag '{import_tag_display}'"
+        )
+
+        duration_days = self._import_duration_days(existing_user)
+
+        # Используем device_limit пользователя из Remnawave, по умолчанию 3
+        user_device_limit = existing_user.hwid_device_limit or 3
+
+        # Определяем traffic_limit из данных Remnawave
+        traffic_limit_gb = -1
+        if existing_user.traffic_limit_bytes:
+            traffic_limit_gb = format_bytes_to_gb(existing_user.traffic_limit_bytes)
+
+        plan_snapshot = PlanSnapshotDto(
+            id=0,  # Виртуальный ID для импортированного плана
+            name=import_name,
+            tag=import_tag_display,  # В боте храним с скобками для читаемости
+            type=format_limits_to_plan_type(traffic_limit_gb, user_device_limit),
+            traffic_limit=traffic_limit_gb,
+            device_limit=user_device_limit,
+            duration=duration_days,
+            traffic_limit_strategy=existing_user.traffic_limit_strategy or "NO_RESET",
+            internal_squads=[],
+            external_squad=None,
+        )
+
+        imported_subscription = SubscriptionDto(
+            user_remna_id=existing_user.uuid,
+            status=existing_user.status,
+            is_trial=False,
+            traffic_limit=traffic_limit_gb,
+            device_limit=user_device_limit,
+            traffic_limit_strategy=existing_user.traffic_limit_strategy or "NO_RESET",
+            tag=import_tag_display,  # В боте храним с скобками
+            internal_squads=[],
+            external_squad=None,
+            expire_at=existing_user.expire_at,
+            url=existing_user.subscription_url,
+            plan=plan_snapshot,
+        )
+
+        await self.subscription_service.create(user, imported_subscription)
+
+        # Меняем тег в панели Remnawave на IMPORT_OLDTAG только если нужно
+        if should_update_remnawave_tag:
+            await self.remnawave.users.update_user(
+                UpdateUserRequestDto(
+                    uuid=existing_user.uuid,
+                    tag=import_tag_remnawave,  # Используем формат с underscore для API
+                    hwid_device_limit=user_device_limit,
+                )
+            )
+        else:
+            # Тег уже IMPORT_xxx, обновляем только device_limit если нужно
+            await self.remnawave.users.update_user(
+                UpdateUserRequestDto(
+                    uuid=existing_user.uuid,
+                    hwid_device_limit=user_device_limit,
+                )
+            )
+
+        tag_change = "changed to" if should_update_remnawave_tag else "kept as"
+        logger.info(
+            f"Created '{import_tag_display}' subscription for user {user.telegram_id}, "
+            f"preserved device_limit={user_device_limit}, duration={duration_days} days, "
+            f"Remnawave tag {tag_change} '{import_tag_remnawave}'"
+        )
+
     async def _validate_and_get_squads(
         self,
         internal_squads: list[UUID] | None,
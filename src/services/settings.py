@@ -1,4 +1,6 @@
-from typing import Any
+import copy
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional, Self
 
 from aiogram import Bot
 from fluentogram import TranslatorHub
@@ -6,7 +8,7 @@ from loguru import logger
 from redis.asyncio import Redis
 
 from src.core.config import AppConfig
-from src.core.constants import TIME_10M
+from src.core.constants import TIME_1M, TIME_5M, TIME_10M
 from src.core.enums import AccessMode, Currency, SystemNotificationType, UserNotificationType
 from src.core.storage.key_builder import build_key
 from src.core.utils.types import AnyNotification
@@ -14,13 +16,14 @@ from src.infrastructure.database import UnitOfWork
 from src.infrastructure.database.models.dto import ExtraDeviceSettingsDto, FeatureSettingsDto, ReferralSettingsDto, SettingsDto
 from src.infrastructure.database.models.sql import Settings
 from src.infrastructure.redis import RedisRepository
-from src.infrastructure.redis.cache import redis_cache
+from src.infrastructure.redis.cache import invalidate_cache, redis_cache
 
 from .base import BaseService
 
 
 class SettingsService(BaseService):
     uow: UnitOfWork
+    _snapshot: Optional[SettingsDto]
 
     def __init__(
         self,
@@ -34,6 +37,15 @@ class SettingsService(BaseService):
     ) -> None:
         super().__init__(config, bot, redis_client, redis_repository, translator_hub)
         self.uow = uow
+        self._snapshot = None
+
+    @asynccontextmanager
+    async def detached(self) -> AsyncIterator[Self]:
+        """A copy of this service on its own unit of work, for background cache refreshes."""
+        async with UnitOfWork(self.uow.session_pool) as uow:
+            service = copy.copy(self)
+            service.uow = uow
+            yield service
 
     async def create(self) -> SettingsDto:
         settings = SettingsDto()
@@ -44,8 +56,23 @@ class SettingsService(BaseService):
         logger.info("Default settings created in DB")
         return SettingsDto.from_model(db_settings)  # type: ignore[return-value]
 
-    @redis_cache(prefix="get_settings", ttl=TIME_10M)
     async def get(self) -> SettingsDto:
+        """
+        Return settings memoized for the lifetime of this (REQUEST-scoped) service.
+        The snapshot is shared, so callers that mutate it must persist it with `update`.
+        """
+        if self._snapshot is None:
+            self._snapshot = await self._get()
+        return self._snapshot
+
+    @redis_cache(
+        prefix="get_settings",
+        ttl=TIME_10M,
+        local_ttl=TIME_1M,
+        lock_ttl=5,
+        stale_ttl=TIME_5M,
+    )
+    async def _get(self) -> SettingsDto:
         db_settings = await self.uow.repository.settings.get()
         if not db_settings:
             return await self.create()
@@ -396,6 +423,7 @@ class SettingsService(BaseService):
     #
 
     async def _clear_cache(self) -> None:
+        self._snapshot = None
         settings_cache_key: str = build_key("cache", "get_settings")
         logger.debug(f"Cache '{settings_cache_key}' cleared")
-        await self.redis_client.delete(settings_cache_key)
+        await invalidate_cache(self.redis_client, settings_cache_key)
@@ -1,5 +1,7 @@
+import copy
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Optional, TypeVar, Union
+from typing import AsyncIterator, Optional, Self, TypeVar, Union
 
 from aiogram import Bot
 from fluentogram import TranslatorHub
@@ -22,8 +24,9 @@ from src.infrastructure.database.models.dto import (
     UserDto,
 )
 from src.infrastructure.database.models.sql import Subscription
+from src.infrastructure.database.repositories import UserLoad
 from src.infrastructure.redis import RedisRepository
-from src.infrastructure.redis.cache import redis_cache
+from src.infrastructure.redis.cache import invalidate_cache, redis_cache
 from src.services.user import UserService
 
 from .base import BaseService
@@ -50,6 +53,14 @@ class SubscriptionService(BaseService):
         self.uow = uow
         self.user_service = user_service
 
+    @asynccontextmanager
+    async def detached(self) -> AsyncIterator[Self]:
+        """A copy of this service on its own unit of work, for background cache refreshes."""
+        async with UnitOfWork(self.uow.session_pool) as uow:
+            service = copy.copy(self)
+            service.uow = uow
+            yield service
+
     async def create(self, user: UserDto, subscription: SubscriptionDto) -> SubscriptionDto:
         data = subscription.model_dump(exclude={"user"})
         data["plan"] = subscription.plan.model_dump(mode="json")
@@ -78,9 +89,10 @@ class SubscriptionService(BaseService):
 
         return SubscriptionDto.from_model(db_subscription)
 
-    @redis_cache(prefix="get_current_subscription", ttl=TIME_1M)
+    @redis_cache(prefix="get_current_subscription", ttl=TIME_1M, stale_ttl=TIME_1M)
     async def get_current(self, telegram_id: int) -> Optional[SubscriptionDto]:
-        db_user = await self.uow.repository.users.get(telegram_id)
+        # Only the column is read, so skip the join and flags of the default profile
+        db_user = await self.uow.repository.users.get(telegram_id, load=UserLoad.MINIMAL)
 
         if not db_user or not db_user.current_subscription_id:
             logger.debug(
@@ -160,7 +172,7 @@ class SubscriptionService(BaseService):
             build_key("cache", "has_used_trial", user_telegram_id),
         ]
 
-        await self.redis_client.delete(*list_cache_keys_to_invalidate)
+        await invalidate_cache(self.redis_client, *list_cache_keys_to_invalidate)
         logger.debug(f"Cache for subscription '{subscription_id}' invalidated")
 
     @staticmethod
@@ -1,4 +1,6 @@
-from typing import Optional, Union
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, Optional, Union
 
 from aiogram import Bot
 from aiogram.types import Message
@@ -12,6 +14,8 @@ from src.core.constants import (
     RECENT_ACTIVITY_MAX_COUNT,
     RECENT_REGISTERED_MAX_COUNT,
     REMNASHOP_PREFIX,
+    STREAM_CHUNK_SIZE,
+    TIME_1M,
     TIME_5M,
     TIME_10M,
 )
@@ -25,13 +29,23 @@ from src.infrastructure.database import UnitOfWork
 from src.infrastructure.database.models.dto import UserDto
 from src.infrastructure.database.models.dto.user import BaseUserDto
 from src.infrastructure.database.models.sql import User
-from src.infrastructure.redis import RedisRepository, redis_cache
+from src.infrastructure.database.repositories import LoadOptions, UserLoad
+from src.infrastructure.redis import (
+    RedisRepository,
+    activity_buffer,
+    get_many_cached,
+    invalidate_cache,
+    invalidate_tags,
+    redis_cache,
+    write_activity,
+)
 
 from .base import BaseService
 
 
 class UserService(BaseService):
     uow: UnitOfWork
+    _lookups: dict[int, Optional[UserDto]]
 
     def __init__(
         self,
@@ -45,6 +59,7 @@ class UserService(BaseService):
     ) -> None:
         super().__init__(config, bot, redis_client, redis_repository, translator_hub)
         self.uow = uow
+        self._lookups = {}
 
     async def create(self, aiogram_user: AiogramUser) -> UserDto:
         user = UserDto(
@@ -66,11 +81,46 @@ class UserService(BaseService):
         db_created_user = await self.uow.repository.users.create(db_user)
         await self.uow.commit()
 
-        await self.clear_user_cache(user.telegram_id)
+        await self.clear_user_cache(user.telegram_id, count_changed=True)
         logger.info(f"Created new user '{user.telegram_id}'")
         return UserDto.from_model(db_created_user)  # type: ignore[return-value]
 
     async def create_from_panel(self, remna_user: RemnaUserDto) -> UserDto:
+        db_user = self._build_from_panel(remna_user)
+        db_created_user = await self.uow.repository.users.create(db_user)
+        await self.uow.commit()
+
+        await self.clear_user_cache(db_created_user.telegram_id, count_changed=True)
+        logger.info(f"Created new user '{db_created_user.telegram_id}' from panel")
+        return UserDto.from_model(db_created_user)  # type: ignore[return-value]
+
+    async def create_many_from_panel(self, remna_users: list[RemnaUserDto]) -> list[UserDto]:
+        """
+        Create bot users for panel users in one INSERT, for bulk syncs. Users that already
+        exist are skipped and not returned; no per-user side effects run here.
+        """
+        db_users = [self._build_from_panel(remna_user) for remna_user in remna_users]
+        try:
+            db_created_users = await self.uow.repository.users.create_many(db_users)
+            await self.uow.commit()
+        except Exception:
+            # Leave the session usable for the caller's per-user fallback
+            await self.uow.rollback()
+            raise
+
+        # Same invalidation as `clear_user_cache`, in one round trip per kind
+        telegram_ids = [db_user.telegram_id for db_user in db_created_users]
+        if telegram_ids:
+            for telegram_id in telegram_ids:
+                self._lookups.pop(telegram_id, None)
+            keys = [build_key("cache", "get_user", telegram_id) for telegram_id in telegram_ids]
+            await invalidate_cache(self.redis_client, *keys)
+            await invalidate_tags(self.redis_client, "users", "users_count")
+
+        logger.info(f"Created '{len(db_created_users)}' new users from panel")
+        return UserDto.from_model_list(db_created_users)
+
+    def _build_from_panel(self, remna_user: RemnaUserDto) -> User:
         # Формируем имя и username - извлекаем из description
         # description в панели содержит "name: Имя\nusername: @username"
         name = str(remna_user.telegram_id)
@@ -98,16 +148,22 @@ class UserService(BaseService):
             role=UserRole.USER,
             language=self.config.default_locale,
         )
-        db_user = User(**user.model_dump())
-        db_created_user = await self.uow.repository.users.create(db_user)
-        await self.uow.commit()
-
-        await self.clear_user_cache(user.telegram_id)
-        logger.info(f"Created new user '{user.telegram_id}' from panel")
-        return UserDto.from_model(db_created_user)  # type: ignore[return-value]
+        return User(**user.model_dump())
 
-    @redis_cache(prefix="get_user", ttl=TIME_5M)
     async def get(self, telegram_id: int) -> Optional[UserDto]:
+        """
+        Return the user memoized for the lifetime of this (REQUEST-scoped) service, so access
+        and user middlewares share one lookup per update. `clear_user_cache` drops the entry,
+        so every invalidation of a user must go through it. Each caller gets its own copy.
+        """
+        if telegram_id not in self._lookups:
+            self._lookups[telegram_id] = await self._get(telegram_id)
+
+        user = self._lookups[telegram_id]
+        return user.model_copy(deep=True) if user else None
+
+    @redis_cache(prefix="get_user", ttl=TIME_5M, negative_ttl=TIME_1M)
+    async def _get(self, telegram_id: int) -> Optional[UserDto]:
         db_user = await self.uow.repository.users.get(telegram_id)
 
         if db_user:
@@ -121,6 +177,18 @@ class UserService(BaseService):
             logger.warning(f"User '{telegram_id}' not found")
             return None
 
+    async def get_many(self, telegram_ids: list[int]) -> dict[int, UserDto]:
+        """Get users by ids sharing the `get` cache. Unknown ids are left out of the result."""
+        return await get_many_cached(
+            self.redis_client,
+            prefix="get_user",
+            ids=telegram_ids,
+            value_type=UserDto,
+            load_missing=self._get_many_from_db,
+            ttl=TIME_5M,
+            negative_ttl=TIME_1M,
+        )
+
     async def get_without_cache(self, telegram_id: int) -> Optional[UserDto]:
         """Получить пользователя без использования кэша (для отладки)"""
         db_user = await self.uow.repository.users.get(telegram_id)
@@ -136,8 +204,14 @@ class UserService(BaseService):
             return None
 
     async def update(self, user: UserDto) -> Optional[UserDto]:
+        """
+        Write the changed fields in a single UPDATE ... RETURNING. The returned user only
+        carries the row's columns: its current subscription and flags are not loaded,
+        callers that need them read the user again through the cached `get`.
+        """
         db_updated_user = await self.uow.repository.users.update(
             telegram_id=user.telegram_id,
+            load=UserLoad.MINIMAL,
             **user.prepare_changed_data(),
         )
 
@@ -194,7 +268,7 @@ class UserService(BaseService):
         result = await self.uow.repository.users.delete(user.telegram_id)
 
         if result:
-            await self.clear_user_cache(user.telegram_id)
+            await self.clear_user_cache(user.telegram_id, count_changed=True)
             await self._remove_from_recent_activity(user.telegram_id)
 
         logger.info(f"Deleted user '{user.telegram_id}': '{result}'")
@@ -214,30 +288,77 @@ class UserService(BaseService):
         user = await self.uow.repository.users.get_by_referral_code(referral_code)
         return UserDto.from_model(user)
 
-    @redis_cache(prefix="users_count", ttl=TIME_10M)
+    @redis_cache(prefix="users_count", ttl=TIME_10M, tags=("users_count",))
     async def count(self) -> int:
         count = await self.uow.repository.users.count()
         logger.debug(f"Total users count: '{count}'")
         return count
 
-    @redis_cache(prefix="get_by_role", ttl=TIME_10M)
+    @redis_cache(prefix="get_by_role", ttl=TIME_10M, tags=("users",))
     async def get_by_role(self, role: UserRole) -> list[UserDto]:
         db_users = await self.uow.repository.users.filter_by_role(role)
         logger.debug(f"Retrieved '{len(db_users)}' users with role '{role}'")
         return UserDto.from_model_list(db_users)
 
-    @redis_cache(prefix="get_blocked_users", ttl=TIME_10M)
+    @redis_cache(prefix="get_blocked_users", ttl=TIME_10M, tags=("users",))
     async def get_blocked_users(self) -> list[UserDto]:
         db_users = await self.uow.repository.users.filter_by_blocked(blocked=True)
         logger.debug(f"Retrieved '{len(db_users)}' blocked users")
         return UserDto.from_model_list(list(reversed(db_users)))
 
-    @redis_cache(prefix="get_all", ttl=TIME_10M)
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        from_end: bool = False,
+        blocked: Optional[bool] = None,
+        load: LoadOptions = UserLoad.MINIMAL,
+    ) -> list[UserDto]:
+        """
+        One page of users by descending Telegram id, for dashboard lists. Cursors are the
+        `UserDto.telegram_id` of the neighbouring page's edge (see `BaseRepository._get_page`).
+        Not cached: a page is a single indexed query.
+        """
+        db_users = await self.uow.repository.users.get_page(
+            limit=limit,
+            after=after,
+            before=before,
+            from_end=from_end,
+            blocked=blocked,
+            load=load,
+        )
+        return UserDto.from_model_list(db_users)
+
+    @redis_cache(prefix="count_blocked", ttl=TIME_10M, tags=("users",))
+    async def count_blocked(self) -> int:
+        return await self.uow.repository.users.count_by_blocked(blocked=True)
+
+    @redis_cache(prefix="get_all", ttl=TIME_10M, lock_ttl=10, tags=("users",))
     async def get_all(self) -> list[UserDto]:
         db_users = await self.uow.repository.users.get_all()
         logger.debug(f"Retrieved '{len(db_users)}' users")
         return UserDto.from_model_list(db_users)
 
+    async def stream_all(
+        self,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        load: LoadOptions = UserLoad.WITH_CURRENT_SUBSCRIPTION,
+    ) -> AsyncIterator[list[UserDto]]:
+        """
+        All users in registration order, in chunks, without holding the whole table.
+        See `BaseRepository.stream`: `aclose()` it when stopping early.
+        """
+        stream = self.uow.repository.users.stream(
+            User,
+            order_by=User.id,
+            chunk_size=chunk_size,
+            options=load,
+        )
+        async with aclosing(stream):
+            async for db_users in stream:
+                yield UserDto.from_model_list(db_users)
+
     async def set_block(self, user: UserDto, blocked: bool) -> None:
         user.is_blocked = blocked
         await self.uow.repository.users.update(
@@ -275,20 +396,23 @@ class UserService(BaseService):
             User,
             order_by=User.id.asc(),
             limit=RECENT_REGISTERED_MAX_COUNT,
+            options=UserLoad.WITH_CURRENT_SUBSCRIPTION,
         )
 
         logger.debug(f"Retrieved '{len(db_users)}' recent registered users")
         return UserDto.from_model_list(list(reversed(db_users)))
 
     async def get_recent_activity_users(self, excluded_ids: list[int] = []) -> list[UserDto]:
-        telegram_ids = await self._get_recent_activity()
+        telegram_ids = [
+            telegram_id
+            for telegram_id in await self._get_recent_activity()
+            if telegram_id not in excluded_ids
+        ]
+        found_users = await self.get_many(telegram_ids)
         users: list[UserDto] = []
 
         for telegram_id in telegram_ids:
-            if telegram_id in excluded_ids:
-                continue
-
-            user = await self.get(telegram_id)
+            user = found_users.get(telegram_id)
 
             if user:
                 users.append(user)
@@ -487,42 +611,43 @@ class UserService(BaseService):
 
     #
 
-    async def clear_user_cache(self, telegram_id: int) -> None:
+    async def clear_user_cache(self, telegram_id: int, count_changed: bool = False) -> None:
+        self._lookups.pop(telegram_id, None)
         user_cache_key: str = build_key("cache", "get_user", telegram_id)
-        await self.redis_client.delete(user_cache_key)
-        await self._clear_list_caches()
-        logger.debug(f"User cache for '{telegram_id}' invalidated")
+        await invalidate_cache(self.redis_client, user_cache_key)
 
-    async def _clear_list_caches(self) -> None:
-        list_cache_keys_to_invalidate = [
-            build_key("cache", "get_blocked_users"),
-            build_key("cache", "count"),
-            build_key("cache", "get_all"),
-        ]
-
-        for role in UserRole:
-            key = build_key("cache", "get_by_role", role=role)
-            list_cache_keys_to_invalidate.append(key)
+        tags = ("users", "users_count") if count_changed else ("users",)
+        await invalidate_tags(self.redis_client, *tags)
+        logger.debug(f"User cache for '{telegram_id}' invalidated")
 
-        await self.redis_client.delete(*list_cache_keys_to_invalidate)
-        logger.debug("List caches invalidated")
+    async def _get_many_from_db(self, telegram_ids: list[int]) -> dict[int, UserDto]:
+        db_users = await self.uow.repository.users.get_by_ids(telegram_ids)
+        logger.debug(f"Retrieved '{len(db_users)}' of '{len(telegram_ids)}' users from DB")
+        return {user.telegram_id: user for user in UserDto.from_model_list(db_users)}
 
     async def _add_to_recent_activity(self, key: StorageKey, telegram_id: int) -> None:
-        await self.redis_repository.list_remove(key, value=telegram_id, count=0)
-        await self.redis_repository.list_push(key, telegram_id)
-        await self.redis_repository.list_trim(key, start=0, end=RECENT_ACTIVITY_MAX_COUNT - 1)
+        packed_key = key.pack()
+        if activity_buffer.touch(packed_key, telegram_id, RECENT_ACTIVITY_MAX_COUNT):
+            return
+
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            write_activity(
+                pipe,
+                packed_key,
+                {str(telegram_id): time.time()},
+                RECENT_ACTIVITY_MAX_COUNT,
+            )
+            await pipe.execute()
         logger.debug(f"User '{telegram_id}' activity updated in recent cache")
 
     async def _remove_from_recent_activity(self, telegram_id: int) -> None:
-        await self.redis_repository.list_remove(
-            key=RecentActivityUsersKey(),
-            value=telegram_id,
-            count=0,
-        )
+        key = RecentActivityUsersKey()
+        activity_buffer.discard(key.pack(), telegram_id)
+        await self.redis_repository.sorted_collection_remove(key, telegram_id)
         logger.debug(f"User '{telegram_id}' removed from recent activity cache")
 
     async def _get_recent_activity(self) -> list[int]:
-        telegram_ids_str = await self.redis_repository.list_range(
+        telegram_ids_str = await self.redis_repository.sorted_collection_revrange(
             key=RecentActivityUsersKey(),
             start=0,
             end=RECENT_ACTIVITY_MAX_COUNT - 1,
@@ -0,0 +1,18 @@
+from typing import AsyncIterator
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def redis() -> AsyncIterator[FakeAsyncRedis]:
+    # The Lua scripts run on fakeredis' embedded interpreter, so `lupa` must be installed
+    client = FakeAsyncRedis()
+    yield client
+    await client.flushall()
+    await client.aclose()
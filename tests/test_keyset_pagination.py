@@ -0,0 +1,82 @@
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from src.infrastructure.database.repositories.base import BaseRepository
+
+pytestmark = pytest.mark.anyio
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    key: Mapped[int] = mapped_column(unique=True, index=True)
+    flag: Mapped[bool] = mapped_column(default=False)
+
+
+@pytest.fixture
+async def repository() -> AsyncIterator[BaseRepository]:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add_all(Item(key=key, flag=key % 2 == 0) for key in range(1, 11))
+        await session.commit()
+        yield BaseRepository(session)
+
+    await engine.dispose()
+
+
+async def keys(repository: BaseRepository, *conditions: object, **kwargs: object) -> list[int]:
+    page = await repository._get_page(Item, *conditions, key=Item.key, **kwargs)  # type: ignore[arg-type]
+    return [item.key for item in page]
+
+
+async def test_first_page(repository: BaseRepository) -> None:
+    assert await keys(repository, limit=3) == [1, 2, 3]
+    assert await keys(repository, limit=3, descending=True) == [10, 9, 8]
+
+
+async def test_after_cursor(repository: BaseRepository) -> None:
+    assert await keys(repository, limit=3, after=3) == [4, 5, 6]
+    assert await keys(repository, limit=3, after=8, descending=True) == [7, 6, 5]
+
+
+async def test_before_cursor_keeps_key_order(repository: BaseRepository) -> None:
+    assert await keys(repository, limit=3, before=7) == [4, 5, 6]
+    assert await keys(repository, limit=3, before=4, descending=True) == [7, 6, 5]
+
+
+async def test_from_end(repository: BaseRepository) -> None:
+    assert await keys(repository, limit=3, from_end=True) == [8, 9, 10]
+    assert await keys(repository, limit=3, from_end=True, descending=True) == [3, 2, 1]
+
+
+async def test_partial_edge_pages(repository: BaseRepository) -> None:
+    assert await keys(repository, limit=3, after=8) == [9, 10]
+    assert await keys(repository, limit=3, before=3) == [1, 2]
+    assert await keys(repository, limit=3, after=10) == []
+
+
+async def test_conditions(repository: BaseRepository) -> None:
+    assert await keys(repository, Item.flag.is_(True), limit=3, after=2) == [4, 6, 8]
+    assert await keys(repository, Item.flag.is_(True), limit=2, from_end=True) == [8, 10]
+
+
+async def test_cursor_row_deleted(repository: BaseRepository) -> None:
+    session: AsyncSession = repository.session
+    await session.execute(delete(Item).where(Item.key == 5))
+    await session.commit()
+
+    assert await keys(repository, limit=2, after=5) == [6, 7]
+    assert await keys(repository, limit=2, before=5) == [3, 4]
+    assert await keys(repository, limit=2, after=3) == [4, 6]
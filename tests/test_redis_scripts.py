@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from src.api.update_stream import _RELEASE_LEASE_SCRIPT, _RENEW_LEASE_SCRIPT
+from src.bot.deletion import MessageDeletionSweeper, schedule_message_deletion
+from src.core.storage.keys import MessageDeletionsKey
+from src.infrastructure.redis.cache import _release_lock, _try_lock
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cache_lock_is_exclusive(redis: FakeAsyncRedis) -> None:
+    token = await _try_lock(redis, "cache:key:lock", 5)
+
+    assert token
+    assert await _try_lock(redis, "cache:key:lock", 5) is None
+
+
+async def test_cache_lock_release_needs_token(redis: FakeAsyncRedis) -> None:
+    token = await _try_lock(redis, "cache:key:lock", 5)
+
+    await _release_lock(redis, "cache:key:lock", "someone-else")
+    assert await redis.get("cache:key:lock") == token.encode()
+
+    await _release_lock(redis, "cache:key:lock", token)
+    assert await redis.get("cache:key:lock") is None
+
+
+async def test_expired_cache_lock_holder_keeps_off_new_lock(redis: FakeAsyncRedis) -> None:
+    stale_token = await _try_lock(redis, "cache:key:lock", 5)
+    await redis.delete("cache:key:lock")  # expired
+    token = await _try_lock(redis, "cache:key:lock", 5)
+
+    await _release_lock(redis, "cache:key:lock", stale_token)
+
+    assert await redis.get("cache:key:lock") == token.encode()
+
+
+async def test_lease_renew_only_by_owner(redis: FakeAsyncRedis) -> None:
+    await redis.set("lease", "owner", px=1_000)
+
+    assert not await redis.eval(_RENEW_LEASE_SCRIPT, 1, "lease", "intruder", 60_000)
+    assert await redis.pttl("lease") <= 1_000
+
+    assert await redis.eval(_RENEW_LEASE_SCRIPT, 1, "lease", "owner", 60_000)
+    assert await redis.pttl("lease") > 1_000
+
+
+async def test_lease_release_only_by_owner(redis: FakeAsyncRedis) -> None:
+    await redis.set("lease", "owner")
+
+    await redis.eval(_RELEASE_LEASE_SCRIPT, 1, "lease", "intruder")
+    assert await redis.get("lease") == b"owner"
+
+    await redis.eval(_RELEASE_LEASE_SCRIPT, 1, "lease", "owner")
+    assert await redis.get("lease") is None
+
+
+async def test_deletion_claim_takes_only_due_entries(redis: FakeAsyncRedis) -> None:
+    for message_id in (1, 2, 3):
+        await schedule_message_deletion(redis, 10, message_id)
+    await schedule_message_deletion(redis, 10, 4, delay=60)
+
+    sweeper = MessageDeletionSweeper(redis, bot=None)  # type: ignore[arg-type]
+    claimed = await sweeper._claim_due()
+
+    assert sorted(claimed) == [b"10:1", b"10:2", b"10:3"]
+    assert await redis.zrange(MessageDeletionsKey().pack(), 0, -1) == [b"10:4"]
+    assert await sweeper._claim_due() == []
+
+
+async def test_concurrent_deletion_claims_do_not_overlap(redis: FakeAsyncRedis) -> None:
+    due = time.time() - 1
+    await redis.zadd(MessageDeletionsKey().pack(), {f"10:{i}": due for i in range(50)})
+
+    sweepers = [MessageDeletionSweeper(redis, bot=None) for _ in range(4)]  # type: ignore[arg-type]
+    claims = await asyncio.gather(*(sweeper._claim_due() for sweeper in sweepers))
+
+    claimed = [item for claim in claims for item in claim]
+    assert len(claimed) == len(set(claimed)) == 50